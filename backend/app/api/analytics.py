@@ -0,0 +1,178 @@
+import csv
+import io
+from datetime import date, datetime, timedelta
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.session import get_read_db, ReadSessionLocal
+from app.models.analytics import CodeTotalRollup, DailyCodeRollup, DailyEncounterRollup
+from app.models.emr import Condition, Encounter, MedicationStatement
+from app.schemas.analytics import CodeCount, DailyCodeCount, DailyEncounterCount
+
+router = APIRouter()
+
+RollupKind = Literal["diagnosis", "severity", "observation", "medication"]
+
+# 기간을 지정하지 않은 일별 조회의 기본 기간
+DEFAULT_DAYS = 30
+
+# CSV 내보내기 시 한 번에 DB에서 읽어 전송할 행 수
+EXPORT_CHUNK_ROWS = 1000
+
+def _date_range(start: Optional[date], end: Optional[date]) -> tuple[date, date]:
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=DEFAULT_DAYS - 1)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start는 end보다 이후일 수 없습니다."
+        )
+    return start, end
+
+@router.get("/encounters", response_model=List[DailyEncounterCount])
+def get_encounter_volume(
+    start: Optional[date] = Query(None, description="시작일 (기본: 최근 30일)"),
+    end: Optional[date] = Query(None, description="종료일 (기본: 오늘)"),
+    db: Session = Depends(get_read_db)
+):
+    """일별 진료 수를 조회합니다."""
+    start, end = _date_range(start, end)
+    return (
+        db.query(DailyEncounterRollup)
+        .filter(DailyEncounterRollup.day.between(start, end), DailyEncounterRollup.encounters > 0)
+        .order_by(DailyEncounterRollup.day)
+        .all()
+    )
+
+@router.get("/codes", response_model=List[CodeCount])
+def get_top_codes(
+    kind: RollupKind = Query("diagnosis", description="diagnosis(진단명) | severity(중증도) | observation(관찰 항목) | medication(약물)"),
+    start: Optional[date] = Query(None, description="시작일 (start, end 모두 없으면 전체 기간)"),
+    end: Optional[date] = Query(None, description="종료일"),
+    limit: int = Query(20, ge=1, le=500),
+    db: Session = Depends(get_read_db)
+):
+    """
+    진단명 빈도, 중증도 분포, 관찰 항목 빈도, 약물 사용 빈도를 조회합니다.
+
+    기간을 지정하지 않으면 전체 기간 누적 집계(rollup_code_totals)를, 지정하면 일별 집계를 합산합니다.
+    """
+    if start is None and end is None:
+        rows = db.execute(
+            select(CodeTotalRollup.code, CodeTotalRollup.count)
+            .where(CodeTotalRollup.kind == kind, CodeTotalRollup.count > 0)
+            .order_by(CodeTotalRollup.count.desc(), CodeTotalRollup.code)
+            .limit(limit)
+        ).all()
+    else:
+        start, end = _date_range(start, end)
+        total = func.sum(DailyCodeRollup.count)
+        rows = db.execute(
+            select(DailyCodeRollup.code, total.label("count"))
+            .where(DailyCodeRollup.kind == kind, DailyCodeRollup.day.between(start, end))
+            .group_by(DailyCodeRollup.code)
+            .having(total > 0)
+            .order_by(total.desc(), DailyCodeRollup.code)
+            .limit(limit)
+        ).all()
+    return [CodeCount(code=code, count=count) for code, count in rows]
+
+@router.get("/codes/daily", response_model=List[DailyCodeCount])
+def get_code_trend(
+    code: str = Query(..., min_length=1, description="진단명, 중증도, 관찰 항목명 또는 약물명"),
+    kind: RollupKind = Query("diagnosis"),
+    start: Optional[date] = Query(None, description="시작일 (기본: 최근 30일)"),
+    end: Optional[date] = Query(None, description="종료일 (기본: 오늘)"),
+    db: Session = Depends(get_read_db)
+):
+    """항목 하나의 일별 추이를 조회합니다."""
+    start, end = _date_range(start, end)
+    rows = db.execute(
+        select(DailyCodeRollup.day, DailyCodeRollup.count)
+        .where(
+            DailyCodeRollup.kind == kind,
+            DailyCodeRollup.code == code,
+            DailyCodeRollup.day.between(start, end),
+            DailyCodeRollup.count > 0,
+        )
+        .order_by(DailyCodeRollup.day)
+    ).all()
+    return [DailyCodeCount(day=day, count=count) for day, count in rows]
+
+def _export_query(dataset: str, start: Optional[date], end: Optional[date]):
+    """내보내기 데이터셋별 (헤더, 쿼리)를 반환합니다."""
+    if dataset in ("daily_encounters", "daily_codes"):
+        if dataset == "daily_encounters":
+            query = select(DailyEncounterRollup.day, DailyEncounterRollup.encounters).order_by(DailyEncounterRollup.day)
+            day = DailyEncounterRollup.day
+        else:
+            query = select(
+                DailyCodeRollup.day, DailyCodeRollup.kind, DailyCodeRollup.code, DailyCodeRollup.count
+            ).order_by(DailyCodeRollup.day, DailyCodeRollup.kind, DailyCodeRollup.code)
+            day = DailyCodeRollup.day
+        if start:
+            query = query.where(day >= start)
+        if end:
+            query = query.where(day <= end)
+        return list(query.selected_columns.keys()), query
+
+    # 연구용 진료 단위 데이터 (환자 이름 등 식별 정보 제외)
+    columns = [
+        Encounter.id.label("encounter_id"),
+        Encounter.patient_id,
+        func.date(Encounter.created_at).label("day"),
+    ]
+    if dataset == "conditions":
+        columns += [Condition.code_text.label("diagnosis"), Condition.severity, Condition.clinical_status]
+        query = select(*columns).join(Condition, Condition.encounter_id == Encounter.id)
+    else:
+        columns += [MedicationStatement.medication_text.label("medication"), MedicationStatement.status]
+        query = select(*columns).join(MedicationStatement, MedicationStatement.encounter_id == Encounter.id)
+    if start:
+        query = query.where(Encounter.created_at >= datetime.combine(start, datetime.min.time()))
+    if end:
+        query = query.where(Encounter.created_at < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    return list(query.selected_columns.keys()), query.order_by(Encounter.id)
+
+@router.get("/export")
+def export_dataset(
+    dataset: Literal["daily_encounters", "daily_codes", "conditions", "medications"] = Query("daily_codes"),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+):
+    """
+    통계/연구용 데이터를 CSV로 내보냅니다.
+
+    - daily_encounters, daily_codes: 집계 테이블
+    - conditions, medications: 진료 단위 진단/약물 기록 (환자 이름 등 식별 정보 제외)
+
+    전체 결과를 메모리에 올리지 않고 EXPORT_CHUNK_ROWS 행씩 읽어 바로 전송합니다.
+    """
+    header, query = _export_query(dataset, start, end)
+
+    def rows():
+        db = ReadSessionLocal()
+        try:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(header)
+            result = db.execute(query.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+            for chunk in result.partitions():
+                writer.writerows(chunk)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        finally:
+            db.close()
+
+    filename = f"{dataset}_{datetime.utcnow().strftime('%Y%m%d')}.csv"
+    return StreamingResponse(
+        rows(),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,6 +1,18 @@
-from fastapi import APIRouter, Response
+import asyncio
+import json
+import math
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.services.llm_service import analyze_with_llm
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db, SessionLocal
+from app.models.job import AnalysisJob, TERMINAL_JOB_STATUSES
+from app.schemas.job import AnalysisJobCreateRequest, AnalysisJobResponse
+from app.services.job_queue import get_job_queue
+from app.services.llm_admission import get_llm_admission, AdmissionRejected
+from app.services.llm_service import analyze_with_llm, LLMNotConfigured
 
 router = APIRouter()
 
@@ -13,4 +25,82 @@ async def analyze_options():
 
 @router.post("/")
 async def analyze(req: AnalyzeRequest):
-    return analyze_with_llm(req.text)
+    try:
+        # 한도 대기 및 LLM 호출이 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        return await run_in_threadpool(analyze_with_llm, req.text)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=e.reason,
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    except LLMNotConfigured as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+@router.get("/admission")
+def get_admission_stats():
+    """LLM 호출 admission control의 대기열 길이와 대기 시간 통계를 반환합니다."""
+    return get_llm_admission().stats()
+
+
+def _get_job_or_404(db: Session, job_id: int) -> AnalysisJob:
+    job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="분석 작업을 찾을 수 없습니다."
+        )
+    return job
+
+@router.post("/jobs", response_model=AnalysisJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_analysis_job(req: AnalysisJobCreateRequest, db: Session = Depends(get_db)):
+    """분석 작업을 대기열에 등록하고 즉시 작업 정보를 반환합니다."""
+    return get_job_queue().submit(db, req.text, priority=req.priority)
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobResponse)
+def get_analysis_job(job_id: int, db: Session = Depends(get_db)):
+    """분석 작업의 상태와 결과를 조회합니다."""
+    return _get_job_or_404(db, job_id)
+
+@router.delete("/jobs/{job_id}", response_model=AnalysisJobResponse)
+def cancel_analysis_job(job_id: int, db: Session = Depends(get_db)):
+    """분석 작업을 취소합니다. 이미 종료된 작업은 그대로 반환합니다."""
+    job = _get_job_or_404(db, job_id)
+    return get_job_queue().cancel(db, job)
+
+@router.get("/jobs/{job_id}/events")
+async def stream_analysis_job(job_id: int):
+    """분석 작업의 상태 변화를 Server-Sent Events로 전송합니다. 종료 상태가 되면 스트림을 닫습니다."""
+    terminal = {s.value for s in TERMINAL_JOB_STATUSES}
+
+    def load_job() -> dict | None:
+        db = SessionLocal()
+        try:
+            job = db.query(AnalysisJob).filter(AnalysisJob.id == job_id).first()
+            if job is None:
+                return None
+            return AnalysisJobResponse.model_validate(job).model_dump(mode="json")
+        finally:
+            db.close()
+
+    if await run_in_threadpool(load_job) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="분석 작업을 찾을 수 없습니다."
+        )
+
+    async def events():
+        last_state = None
+        while True:
+            job = await run_in_threadpool(load_job)
+            if job is None:
+                break
+            state = (job["status"], job["attempts"], job["cancel_requested"])
+            if state != last_state:
+                last_state = state
+                yield f"event: status\ndata: {json.dumps(job, ensure_ascii=False)}\n\n"
+            if job["status"] in terminal:
+                break
+            await asyncio.sleep(get_job_queue().poll_interval)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
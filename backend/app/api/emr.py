@@ -1,18 +1,22 @@
 from datetime import datetime
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
-from app.db.session import get_db
+from app.db.session import get_read_db, get_write_db
 from app.services.fhir_mapper import FHIRMapper
+from app.services import rollups
+from app.services.patient_search import get_patient_search_index, record_patient_change
 from app.models.emr import Patient, Encounter, Condition, Observation, MedicationStatement, Conversation
 from app.schemas.emr import (
     EMRSaveRequest,
     EMRSaveResponse,
     EMRRecord,
     PatientListResponse,
+    CohortCountResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -23,7 +27,7 @@ fhir_mapper = FHIRMapper()
 @router.post("/save", response_model=EMRSaveResponse, status_code=status.HTTP_201_CREATED)
 def save_emr(
     request: EMRSaveRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     try:
         # 환자 정보 매핑 (LLM 결과 대신 입력받은 정보 사용)
@@ -71,8 +75,21 @@ def save_emr(
             db.add(Observation(**obs_data))
         for med_data in sub_resources.get("medication_statements", []):
             db.add(MedicationStatement(**med_data))
+
+        # 환자 검색 인덱스 변경 기록과 통계 집계 테이블 증분 갱신 (기록과 같은 트랜잭션)
+        record_patient_change(db, patient.id, "upsert")
+        rollups.apply_encounter(
+            db,
+            encounter.created_at.date(),
+            rollups.encounter_code_counts(
+                sub_resources.get("conditions", []),
+                sub_resources.get("observations", []),
+                sub_resources.get("medication_statements", []),
+            ),
+        )
         
         db.commit()
+        get_patient_search_index().mark_stale()
         
         return EMRSaveResponse(
             patient_id=patient.id,
@@ -91,13 +108,28 @@ def save_emr(
 
 
 @router.get("/patients", response_model=List[PatientListResponse])
-def get_patients(db: Session = Depends(get_db)):
+def get_patients(db: Session = Depends(get_read_db)):
     """모든 환자 목록을 조회합니다."""
     patients = db.query(Patient).order_by(Patient.created_at.desc()).all()
     return patients
 
+@router.get("/patients/search", response_model=List[PatientListResponse])
+def search_patients(
+    q: str = Query(..., min_length=1, description="차트번호 또는 이름 일부, 이름 초성 (예: ㄱㅁㅅ)"),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """
+    환자를 차트번호/이름으로 검색합니다 (입력 중 자동완성용).
+
+    메모리 인덱스에서 검색하며, 다른 워커에서 저장/삭제된 환자는 PATIENT_SEARCH_SYNC_SECONDS 이내에 반영됩니다.
+    """
+    index = get_patient_search_index()
+    index.sync(db)
+    return index.search(q, limit)
+
 @router.get("/patients/{patient_id}", response_model=PatientListResponse)
-def get_patient(patient_id: int, db: Session = Depends(get_db)):
+def get_patient(patient_id: int, db: Session = Depends(get_read_db)):
     """환자 상세 정보를 조회합니다."""
     patient = db.query(Patient).filter(Patient.id == patient_id).first()
     if not patient:
@@ -110,7 +142,7 @@ def get_patient(patient_id: int, db: Session = Depends(get_db)):
 @router.get("/records/{patient_id}", response_model=List[EMRRecord])
 def get_patient_records(
     patient_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """환자의 모든 진료 기록을 조회합니다."""
     encounters = (
@@ -140,10 +172,90 @@ def get_patient_records(
     return records
 
 
+def _text_filter(column, value: str, match: str):
+    """생성 컬럼에 대한 일치/접두사 조건. 접두사는 LIKE 대신 범위 조건으로 인덱스를 탐색합니다."""
+    if match == "prefix":
+        upper = value[:-1] + chr(ord(value[-1]) + 1)
+        return and_(column >= value, column < upper)
+    return column == value
+
+def _cohort_encounter_ids(
+    diagnosis: Optional[str],
+    medication: Optional[str],
+    severity: Optional[str],
+    match: str,
+):
+    """조건에 맞는 진료(Encounter) ID 서브쿼리. 진단과 약물은 같은 진료에 기록된 경우만 일치로 봅니다."""
+    if not (diagnosis or medication or severity):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="diagnosis, medication, severity 중 하나 이상을 지정해야 합니다."
+        )
+
+    medication_ids = None
+    if medication:
+        medication_ids = select(MedicationStatement.encounter_id).where(
+            _text_filter(MedicationStatement.medication_text, medication, match)
+        )
+    if not (diagnosis or severity):
+        return medication_ids
+
+    query = select(Condition.encounter_id)
+    if diagnosis:
+        query = query.where(_text_filter(Condition.code_text, diagnosis, match))
+    if severity:
+        query = query.where(Condition.severity == severity)
+    if medication_ids is not None:
+        query = query.where(Condition.encounter_id.in_(medication_ids))
+    return query
+
+@router.get("/cohort", response_model=List[PatientListResponse])
+def get_cohort(
+    diagnosis: Optional[str] = Query(None, min_length=1, description="진단명 (Condition.code.text)"),
+    medication: Optional[str] = Query(None, min_length=1, description="약물명 (MedicationStatement.medication.text)"),
+    severity: Optional[str] = Query(None, description="mild | moderate | severe"),
+    match: Literal["exact", "prefix"] = Query("exact", description="진단명/약물명 일치 방식"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db)
+):
+    """
+    진단명, 약물명, 중증도로 환자를 조회합니다 (예: 주요우울장애로 진단받고 프로작을 복용 중인 환자).
+
+    code.text / medication.text의 인덱스된 생성 컬럼만 사용하므로 JSON을 읽지 않고 SQL에서 처리됩니다.
+    """
+    encounter_ids = _cohort_encounter_ids(diagnosis, medication, severity, match)
+    patient_ids = select(Encounter.patient_id).where(Encounter.id.in_(encounter_ids))
+    return (
+        db.query(Patient)
+        .filter(Patient.id.in_(patient_ids))
+        .order_by(Patient.id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+@router.get("/cohort/count", response_model=CohortCountResponse)
+def get_cohort_count(
+    diagnosis: Optional[str] = Query(None, min_length=1),
+    medication: Optional[str] = Query(None, min_length=1),
+    severity: Optional[str] = Query(None),
+    match: Literal["exact", "prefix"] = Query("exact"),
+    db: Session = Depends(get_read_db)
+):
+    """조건에 맞는 환자 수와 진료 수를 반환합니다."""
+    encounter_ids = _cohort_encounter_ids(diagnosis, medication, severity, match)
+    patients, encounters = db.execute(
+        select(func.count(func.distinct(Encounter.patient_id)), func.count(Encounter.id))
+        .where(Encounter.id.in_(encounter_ids))
+    ).one()
+    return CohortCountResponse(patients=patients, encounters=encounters)
+
+
 @router.delete("/records/{encounter_id}")
 def delete_encounter_record(
     encounter_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """특정 진료 기록을 삭제합니다."""
     try:
@@ -155,6 +267,9 @@ def delete_encounter_record(
                 detail="진료 기록을 찾을 수 없습니다."
             )
         
+        # 통계 집계에서 제외
+        rollups.remove_encounter(db, encounter)
+
         # 관련 데이터 삭제 (CASCADE 설정에 따라 자동 삭제됨)
         # Conversation 삭제
         if encounter.conversation:
@@ -197,7 +312,7 @@ def delete_encounter_record(
 @router.delete("/patients/{patient_id}")
 def delete_patient(
     patient_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_write_db)
 ):
     """환자와 관련된 모든 데이터를 삭제합니다."""
     try:
@@ -214,6 +329,9 @@ def delete_patient(
         
         # 각 Encounter의 관련 데이터 삭제
         for encounter in encounters:
+            # 통계 집계에서 제외
+            rollups.remove_encounter(db, encounter)
+
             # Conversation 삭제
             if encounter.conversation:
                 db.delete(encounter.conversation)
@@ -235,7 +353,9 @@ def delete_patient(
         
         # 환자 삭제
         db.delete(patient)
+        record_patient_change(db, patient_id, "delete")
         db.commit()
+        get_patient_search_index().mark_stale()
         
         return {"message": "환자와 관련된 모든 데이터가 성공적으로 삭제되었습니다."}
         
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import logging
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.live_session import LiveSession
+from app.services.llm_admission import AdmissionRejected
+from app.services.llm_service import analyze_incremental, analyze_with_llm, LLMNotConfigured
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.websocket("/live")
+async def live_analysis(websocket: WebSocket):
+    """
+    진료 중 실시간 분석 세션입니다.
+
+    클라이언트 → 서버:
+      {"type": "turns", "turns": [{"speaker": "의사", "text": "..."}, ...]}  발화 추가
+      {"type": "end"}                                                     세션 종료 및 최종 분석 요청
+
+    서버 → 클라이언트:
+      {"type": "ack", "pending_turns": n}
+      {"type": "update", "version": n, "analyzed_turns": n, "result": {...}}  증분 분석 결과
+      {"type": "final", "result": {...}}                                       전체 대화 기준 최종 분석 결과
+      {"type": "error", "detail": "...", "retry_after": 초 | null}
+
+    발화가 추가되면 LIVE_DEBOUNCE_SECONDS 동안 추가 발화가 없을 때까지 기다린 뒤,
+    새 발화와 현재 분석 결과만 LLM에 보내 변경 사항을 병합합니다.
+    """
+    await websocket.accept()
+    session = LiveSession()
+    pending = asyncio.Event()
+    last_delta_at = 0.0
+    loop = asyncio.get_running_loop()
+
+    async def analyze_pending() -> None:
+        upto = len(session.turns)
+        if upto == session.analyzed_turns:
+            return
+        try:
+            delta = await run_in_threadpool(analyze_incremental, session.state, session.pending_text(upto))
+        except AdmissionRejected as e:
+            # 반영되지 않은 발화는 다음 발화와 함께 다시 분석
+            await websocket.send_json({"type": "error", "detail": e.reason, "retry_after": e.retry_after})
+            return
+        except (LLMNotConfigured, ValueError) as e:
+            await websocket.send_json({"type": "error", "detail": str(e), "retry_after": None})
+            return
+
+        session.apply(delta, upto)
+        await websocket.send_json({
+            "type": "update",
+            "version": session.version,
+            "analyzed_turns": session.analyzed_turns,
+            "result": session.state,
+        })
+
+    async def analyzer():
+        while True:
+            await pending.wait()
+            # 디바운스: 마지막 발화 이후 일정 시간 추가 발화가 없을 때까지 대기
+            while (remaining := last_delta_at + settings.LIVE_DEBOUNCE_SECONDS - loop.time()) > 0:
+                await asyncio.sleep(remaining)
+            pending.clear()
+            try:
+                await analyze_pending()
+            except Exception as e:
+                # 한 번의 갱신 실패로 이후 실시간 분석이 멈추지 않도록 기록만 하고 계속 진행
+                logger.error(f"실시간 분석 갱신 중 오류 발생: {e}", exc_info=True)
+
+    async def send_error(detail: str, retry_after=None) -> None:
+        await websocket.send_json({"type": "error", "detail": detail, "retry_after": retry_after})
+
+    analyzer_task = asyncio.create_task(analyzer())
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except json.JSONDecodeError:
+                await send_error("메시지가 올바른 JSON 형식이 아닙니다.")
+                continue
+            if not isinstance(message, dict):
+                await send_error("메시지는 JSON 객체여야 합니다.")
+                continue
+            message_type = message.get("type")
+
+            if message_type == "turns":
+                turns = message.get("turns") or []
+                if not isinstance(turns, list) or not all(isinstance(turn, dict) for turn in turns):
+                    await send_error("turns는 발화 객체의 배열이어야 합니다.")
+                    continue
+                session.add_turns(turns)
+                last_delta_at = loop.time()
+                pending.set()
+                await websocket.send_json({"type": "ack", "pending_turns": session.pending_turns})
+
+            elif message_type == "end":
+                if not session.turns:
+                    await websocket.send_json({"type": "final", "result": session.state})
+                    break
+                # 세션 종료 시 전체 대화로 한 번 더 분석하여 최종 결과를 확정
+                # (실패하면 세션을 계속 사용할 수 있도록 증분 분석은 최종 결과가 나온 뒤에 중단)
+                try:
+                    result = await run_in_threadpool(analyze_with_llm, session.full_text())
+                except AdmissionRejected as e:
+                    await send_error(e.reason, e.retry_after)
+                    continue
+                except (LLMNotConfigured, ValueError) as e:
+                    await send_error(str(e))
+                    continue
+                analyzer_task.cancel()
+                await websocket.send_json({"type": "final", "result": result})
+                break
+
+            else:
+                await send_error(f"알 수 없는 메시지 형식입니다: {message_type}")
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info("실시간 분석 세션 연결이 종료되었습니다.")
+    finally:
+        analyzer_task.cancel()
@@ -1,16 +1,89 @@
+from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
-    # Azure OpenAI 설정
-    AZURE_API_KEY: str
-    AZURE_ENDPOINT: str
-    AZURE_API_VERSION: str
-    AZURE_DEPLOYMENT_NAME: str
+    # Azure OpenAI 설정 (없어도 서버와 EMR API는 동작하며, 분석 API만 503을 반환)
+    AZURE_API_KEY: Optional[str] = None
+    AZURE_ENDPOINT: Optional[str] = None
+    AZURE_API_VERSION: Optional[str] = None
+    AZURE_DEPLOYMENT_NAME: Optional[str] = None
+
+    # LLM 호출 한도 설정 (배포 전체 한도, 0이면 제한 없음)
+    AZURE_TPM_LIMIT: int = 30000  # 분당 토큰 수
+    AZURE_RPM_LIMIT: int = 180  # 분당 요청 수
+    # 한도를 나눠 쓰는 서버 프로세스 수 (uvicorn/gunicorn --workers 수)
+    # 버킷은 프로세스마다 따로 있으므로 각 프로세스는 한도를 이 값으로 나눈 만큼만 허용 (1로 두고 여러 워커로 실행하면 한도 × 워커 수까지 허용됨)
+    LLM_ADMISSION_PROCESSES: int = 1
+    LLM_MAX_TOKENS: int = 2000  # 응답 최대 토큰 수 (요청 비용 예약에도 사용)
+    # LLM 출력 형식: full(기존 FHIR-유사 JSON) | compact(짧은 키 + JSON 스키마 구조화 출력, 서버에서 FHIR 구조로 복원)
+    # compact는 json_schema response_format을 지원하는 배포(API 2024-08-01-preview 이상)에서만 사용
+    LLM_OUTPUT_FORMAT: str = "full"
+    # 응답의 일부 리소스가 누락되었거나 잘못된 경우 해당 리소스만 한 번 더 요청 (False면 바로 기본값 사용)
+    LLM_SECTION_RETRY: bool = True
+    LLM_SECTION_RETRY_MAX_TOKENS: int = 800  # 재요청 응답 최대 토큰 수
+    LLM_ADMISSION_MAX_QUEUE: int = 50  # 한도 초과 시 대기할 수 있는 최대 요청 수
+    LLM_ADMISSION_MAX_WAIT_SECONDS: float = 10.0  # 최대 대기 시간 (초과 예상 시 즉시 429)
+
+    # 대화 전처리 설정 (LLM 호출 전 적용할 단계, 쉼표로 구분, 빈 값이면 전처리 안 함)
+    TRANSCRIPT_PREPROCESS_STEPS: str = "timestamps,speakers,fillers,backchannels,repeats"
+
+    # 실시간 분석 세션 설정
+    LIVE_DEBOUNCE_SECONDS: float = 2.0  # 마지막 발화 후 이 시간 동안 추가 발화가 없으면 증분 분석
 
     # 데이터베이스 설정
     DATABASE_URL: str = "sqlite:///./emr.db"
+    DATABASE_READ_URL: Optional[str] = None  # 조회용 복제본 (PostgreSQL 등, 없으면 DATABASE_URL에 읽기 전용 연결)
+    DB_WRITE_POOL_SIZE: int = 2  # 쓰기용 풀 크기 (SQLite는 쓰기가 직렬화되므로 작게 유지)
+    DB_WRITE_MAX_OVERFLOW: int = 2
+    DB_READ_POOL_SIZE: int = 8  # 조회용 풀 크기
+    DB_READ_MAX_OVERFLOW: int = 8
+    SQLITE_WAL: bool = True  # WAL 모드 (쓰기 중에도 조회가 막히지 않음)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # 잠금 대기 시간
+
+    # SQL 프로파일링 설정 (개발/디버깅용)
+    SQL_PROFILE_ENABLED: bool = False  # 요청별 SQL 기록 및 X-SQL-Profile 응답 헤더
+    SQL_SLOW_QUERY_MS: float = 100.0  # 이 시간을 넘는 쿼리는 실행 계획과 함께 로그
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5  # 한 요청에서 같은 형태의 쿼리가 이 횟수를 넘으면 N+1로 판단
+
+    # 비동기 분석 작업 큐 설정
+    JOB_WORKERS: int = 2  # 프로세스당 백그라운드 워커 수 (LLM 동시 호출 수)
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0  # 대기 중인 작업 확인 주기
+    JOB_LEASE_SECONDS: int = 600  # 워커가 작업을 점유하는 최대 시간 (초과 시 재할당)
+    JOB_MAX_ATTEMPTS: int = 3  # 작업당 최대 시도 횟수
+    JOB_RETRY_BACKOFF_SECONDS: float = 5.0  # LLM 호출 실패 후 첫 재시도까지 대기 시간 (시도마다 2배)
+    JOB_RETRY_BACKOFF_MAX_SECONDS: float = 300.0  # 재시도 대기 시간 상한
+
+    # 환자 검색 인덱스 설정
+    PATIENT_SEARCH_SYNC_SECONDS: float = 1.0  # 다른 워커의 환자 저장/삭제를 확인하는 주기
+    PATIENT_CHANGE_RETENTION_HOURS: int = 24  # 환자 변경 기록 보관 기간 (서버 시작 시 정리)
+
+    # 시작 시 준비 작업 (첫 요청 지연을 줄이기 위해 lifespan에서 DB 연결과 LLM 클라이언트를 미리 생성)
+    WARM_UP_ON_STARTUP: bool = True
+
+    @property
+    def llm_configured(self) -> bool:
+        return all((self.AZURE_API_KEY, self.AZURE_ENDPOINT, self.AZURE_API_VERSION, self.AZURE_DEPLOYMENT_NAME))
 
     class Config:
         env_file = ".env"
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """설정 객체를 반환합니다 (.env는 처음 호출될 때 한 번만 읽음)."""
+    return Settings()
+
+class _LazySettings:
+    """
+    get_settings()의 결과에 속성 접근을 위임하는 대리 객체입니다.
+
+    `from app.config import settings`를 import해도 .env를 읽지 않고, 처음 속성에 접근할 때 설정 객체를 만듭니다.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_settings(), name, value)
+
+settings = _LazySettings()
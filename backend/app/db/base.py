@@ -6,6 +6,9 @@ from app.models.emr import (
     Observation,
     MedicationStatement,
 )
+from app.models.job import AnalysisJob
+from app.models.analytics import DailyEncounterRollup, DailyCodeRollup, CodeTotalRollup
+from app.models.change_log import PatientChange
 
 # Base와 모든 모델을 한 곳에서 import할 수 있도록 함
 __all__ = [
@@ -15,4 +18,9 @@ __all__ = [
     "Condition",
     "Observation",
     "MedicationStatement",
+    "AnalysisJob",
+    "DailyEncounterRollup",
+    "DailyCodeRollup",
+    "CodeTotalRollup",
+    "PatientChange",
 ]
@@ -1,23 +1,78 @@
 import logging
+from datetime import datetime, timedelta
+from sqlalchemy import delete, inspect, text
 from sqlalchemy.exc import SQLAlchemyError
-from app.db.base import Base
-from app.db.session import engine
+from sqlalchemy.schema import CreateColumn
+from app.db.base import AnalysisJob, Base, Condition, Observation, MedicationStatement, DailyEncounterRollup, PatientChange
+from app.config import settings
+from app.db.session import get_engine, SessionLocal
+from app.services.rollups import rebuild_rollups
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 기존 DB에 나중에 추가된 컬럼 (create_all은 이미 있는 테이블에 컬럼을 추가하지 않음)
+ADDED_COLUMNS = (
+    Condition.__table__.c.code_text,
+    Observation.__table__.c.code_text,
+    MedicationStatement.__table__.c.medication_text,
+    AnalysisJob.__table__.c.available_at,
+)
+
+def _add_missing_columns() -> None:
+    """기존 테이블에 없는 컬럼(생성 컬럼 포함)을 추가합니다."""
+    engine = get_engine()
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for column in ADDED_COLUMNS:
+            existing = {c["name"] for c in inspector.get_columns(column.table.name)}
+            if column.name in existing:
+                continue
+            ddl = str(CreateColumn(column).compile(dialect=engine.dialect))
+            if engine.dialect.name == "sqlite":
+                # SQLite는 ALTER TABLE로 STORED 생성 컬럼을 추가할 수 없으므로 VIRTUAL로 추가 (인덱스는 동일하게 사용)
+                ddl = ddl.replace(" STORED", " VIRTUAL")
+            conn.execute(text(f"ALTER TABLE {column.table.name} ADD COLUMN {ddl}"))
+            logger.info(f"{column.table.name}.{column.name} 컬럼을 추가했습니다.")
+
+def _create_missing_indexes() -> None:
+    """기존 테이블에 없는 인덱스를 생성합니다."""
+    engine = get_engine()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def _prune_patient_changes() -> None:
+    """보관 기간이 지난 환자 변경 기록을 삭제합니다 (각 워커는 시작 시 검색 인덱스를 새로 만듦)."""
+    cutoff = datetime.utcnow() - timedelta(hours=settings.PATIENT_CHANGE_RETENTION_HOURS)
+    with SessionLocal() as db:
+        db.execute(delete(PatientChange).where(PatientChange.created_at < cutoff))
+        db.commit()
+
 def init_db() -> None:
     """
     데이터베이스 테이블 생성
     """
+    engine = get_engine()
     try:
+        rollups_missing = not inspect(engine).has_table(DailyEncounterRollup.__tablename__)
+
         # 모든 테이블 생성
         Base.metadata.create_all(bind=engine)
+        # 기존 DB에 나중에 추가된 컬럼(검색용 생성 컬럼 등)과 인덱스 추가 (이미 있으면 건너뜀)
+        _add_missing_columns()
+        _create_missing_indexes()
+
+        # 집계 테이블이 새로 생긴 경우 기존 기록으로 채움
+        if rollups_missing:
+            with SessionLocal() as db:
+                rebuild_rollups(db)
+        _prune_patient_changes()
         logger.info("✅ 데이터베이스 테이블이 성공적으로 생성되었습니다.")
     except SQLAlchemyError as e:
         logger.error(f"❌ 데이터베이스 초기화 중 오류 발생: {e}")
         raise
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     logger.info("데이터베이스 테이블을 생성합니다...")
     init_db() 
\ No newline at end of file
@@ -0,0 +1,170 @@
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# 호출 위치 탐색 시 건너뛸 파일 (SQLAlchemy 내부, 프로파일러 자신, 세션 팩토리)
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_SKIP_FILES = (os.path.abspath(__file__), os.path.join(_APP_DIR, "db", "session.py"))
+
+# IN (?, ?, ?) 처럼 파라미터 개수만 다른 문장을 같은 형태로 취급
+_IN_LIST_RE = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|%s|:\w+)\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class StatementRecord:
+    """프로파일링 중 실행된 SQL 문 하나의 기록입니다."""
+    statement: str
+    duration_ms: float
+    call_site: str
+
+
+@dataclass
+class RequestProfile:
+    """요청 하나에서 실행된 모든 SQL 문과 요약입니다."""
+    statements: List[StatementRecord] = field(default_factory=list)
+    slow_count: int = 0
+
+    @property
+    def total_ms(self) -> float:
+        return sum(s.duration_ms for s in self.statements)
+
+    def repeated_shapes(self, threshold: int) -> List[tuple[str, int, str]]:
+        """같은 형태의 문장이 threshold회를 넘게 실행된 경우 (형태, 횟수, 첫 호출 위치)를 반환합니다."""
+        counts = Counter(statement_shape(s.statement) for s in self.statements)
+        first_site = {}
+        for s in self.statements:
+            first_site.setdefault(statement_shape(s.statement), s.call_site)
+        return [
+            (shape, count, first_site[shape])
+            for shape, count in counts.most_common()
+            if count > threshold
+        ]
+
+    def summary(self, threshold: int) -> str:
+        return (
+            f"statements={len(self.statements)}; total_ms={self.total_ms:.1f}; "
+            f"slow={self.slow_count}; n_plus_one={len(self.repeated_shapes(threshold))}"
+        )
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """N+1 탐지를 위해 SQL 문을 정규화합니다."""
+    return _IN_LIST_RE.sub("(?)", _WHITESPACE_RE.sub(" ", statement).strip())
+
+
+def _call_site() -> str:
+    """SQL 문을 실행시킨 애플리케이션 코드 위치(파일:줄 함수)를 찾습니다."""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and filename not in _SKIP_FILES:
+            return f"{os.path.relpath(filename, os.path.dirname(_APP_DIR))}:{frame.f_lineno} {frame.f_code.co_name}"
+        if fallback is None and f"{os.sep}sqlalchemy{os.sep}" not in filename and filename not in _SKIP_FILES:
+            # 응답 직렬화 중 lazy load 등 애플리케이션 코드 밖에서 실행된 경우
+            fallback = f"{os.path.basename(filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback or "unknown"
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """느린 쿼리의 실행 계획을 조회합니다. 이벤트가 다시 발생하지 않도록 DBAPI 커서를 직접 사용합니다."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif dialect == "postgresql":
+        prefix = "EXPLAIN "
+    else:
+        return None
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    except Exception as e:
+        return f"(실행 계획 조회 실패: {e})"
+    if dialect == "sqlite":
+        # (id, parent, notused, detail)
+        return "\n".join(str(row[-1]) for row in rows)
+    return "\n".join(str(row[0]) for row in rows)
+
+
+def install_profiler(engine: Engine, slow_query_ms: float) -> None:
+    """엔진에 SQL 프로파일러를 연결합니다. 프로파일링 중인 요청에서만 기록합니다."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("profiler_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        if profile is None:
+            return
+        duration_ms = (time.perf_counter() - conn.info["profiler_start_time"].pop()) * 1000
+        call_site = _call_site()
+        profile.statements.append(StatementRecord(statement, duration_ms, call_site))
+
+        if duration_ms >= slow_query_ms:
+            profile.slow_count += 1
+            plan = None if executemany else _explain(conn, statement, parameters)
+            logger.warning(
+                f"느린 쿼리 ({duration_ms:.1f}ms, {call_site}): {statement}"
+                + (f"\n실행 계획:\n{plan}" if plan else "")
+            )
+
+
+class SQLProfilerMiddleware:
+    """
+    요청별로 실행된 SQL 문을 기록하고 요약을 응답 헤더로 반환하는 ASGI 미들웨어입니다.
+
+    같은 형태의 문장이 n_plus_one_threshold회를 넘게 반복되면 N+1 패턴으로 보고 경고를 남깁니다.
+    """
+
+    def __init__(self, app, n_plus_one_threshold: int, header_name: str = "X-SQL-Profile"):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.header_name = header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self.header_name, profile.summary(self.n_plus_one_threshold).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            for shape, count, call_site in profile.repeated_shapes(self.n_plus_one_threshold):
+                logger.warning(
+                    f"N+1 의심 ({scope['method']} {scope['path']}): 같은 쿼리가 {count}회 실행됨 "
+                    f"({call_site}): {shape}"
+                )
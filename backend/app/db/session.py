@@ -1,25 +1,209 @@
-from sqlalchemy import create_engine
+import threading
+from typing import Optional
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker, Session
 from app.config import settings
+from app.services.metrics import instrument_engine
+from app.db.profiler import install_profiler
 
-# SQLite 데이터베이스 URL 설정
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL or "sqlite:///./emr.db"
+def _is_file_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def _sqlite_read_only_url(url: str) -> str:
+    """sqlite:///path.db → sqlite:///file:path.db?mode=ro&uri=true (읽기 전용으로 파일을 여는 URI)"""
+    parsed = make_url(url)
+    return str(parsed.set(database=f"file:{parsed.database}", query={"mode": "ro", "uri": "true"}))
+
+
+def create_write_engine(url: str, pool_size: int, max_overflow: int) -> Engine:
+    """
+    쓰기 전용 엔진을 생성합니다.
+
+    SQLite 파일 DB는 WAL 모드로 전환하여 쓰기 중에도 읽기 연결이 막히지 않도록 하고,
+    쓰기는 한 번에 하나만 가능하므로 작은 풀을 사용합니다.
+    """
+    if make_url(url).get_backend_name() != "sqlite":
+        return create_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=True)
+
+    if not _is_file_sqlite(url):
+        # 메모리 DB는 연결마다 별개의 DB이므로 풀 크기 설정 없이 기본 동작 유지
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},  # SQLite 전용 설정
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if settings.SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+    return engine
+
+
+def create_read_engine(
+    url: str,
+    read_url: Optional[str],
+    pool_size: int,
+    max_overflow: int,
+) -> Optional[Engine]:
+    """
+    읽기 전용 엔진을 생성합니다. 쓰기 엔진을 그대로 사용해야 하면 None을 반환합니다.
+
+    - read_url이 있으면 (PostgreSQL 복제본 등) 해당 DB에 연결
+    - SQLite 파일 DB는 같은 파일을 mode=ro URI로 열어 별도 풀 사용 (WAL 모드에서 쓰기와 동시에 읽기 가능)
+    - PostgreSQL은 같은 DB에 읽기 전용 트랜잭션 연결로 별도 풀 사용
+    """
+    target = read_url or url
+    backend = make_url(target).get_backend_name()
+
+    if backend == "sqlite":
+        if not _is_file_sqlite(target):
+            return None
+        engine = create_engine(
+            _sqlite_read_only_url(target),
+            connect_args={"check_same_thread": False},
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+        )
+
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.close()
+
+        return engine
+
+    connect_args = {}
+    if backend == "postgresql" and not read_url:
+        connect_args["options"] = "-c default_transaction_read_only=on"
+    return create_engine(
+        target,
+        connect_args=connect_args,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,
+    )
+
+
+# 엔진 생성 (쓰기용 / 읽기용 풀 분리)
+# import 시에는 설정을 읽거나 연결 풀을 만들지 않고, 처음 세션을 만들 때(또는 warm_up_db에서) 생성
+_engines: Optional[tuple[Engine, Engine]] = None
+_engines_lock = threading.Lock()
+
+
+def _get_engines() -> tuple[Engine, Engine]:
+    """(쓰기용, 읽기용) 엔진을 반환합니다. 읽기용 엔진을 따로 만들 수 없으면 쓰기용 엔진을 함께 사용합니다."""
+    global _engines
+    if _engines is None:
+        with _engines_lock:
+            if _engines is None:
+                url = settings.DATABASE_URL or "sqlite:///./emr.db"
+                write_engine = create_write_engine(
+                    url,
+                    pool_size=settings.DB_WRITE_POOL_SIZE,
+                    max_overflow=settings.DB_WRITE_MAX_OVERFLOW,
+                )
+                read_engine = create_read_engine(
+                    url,
+                    settings.DATABASE_READ_URL,
+                    pool_size=settings.DB_READ_POOL_SIZE,
+                    max_overflow=settings.DB_READ_MAX_OVERFLOW,
+                ) or write_engine
+
+                # SQL 문 수/실행 시간 지표 수집
+                instrument_engine(write_engine, role="write")
+                if read_engine is not write_engine:
+                    instrument_engine(read_engine, role="read")
+
+                # 요청별 SQL 프로파일링 (SQL_PROFILE_ENABLED=true 일 때만)
+                if settings.SQL_PROFILE_ENABLED:
+                    install_profiler(write_engine, slow_query_ms=settings.SQL_SLOW_QUERY_MS)
+                    if read_engine is not write_engine:
+                        install_profiler(read_engine, slow_query_ms=settings.SQL_SLOW_QUERY_MS)
+                _engines = (write_engine, read_engine)
+    return _engines
+
+
+def get_engine() -> Engine:
+    """쓰기용 엔진"""
+    return _get_engines()[0]
+
+
+def get_read_engine() -> Engine:
+    """읽기용 엔진 (따로 없으면 쓰기용 엔진)"""
+    return _get_engines()[1]
+
+
+class _LazySessionmaker(sessionmaker):
+    """처음 세션을 만들 때 엔진을 생성하여 바인딩하는 sessionmaker입니다."""
+
+    def __init__(self, engine_factory, **kw):
+        super().__init__(**kw)
+        self._engine_factory = engine_factory
+
+    def __call__(self, **local_kw) -> Session:
+        if self.kw.get("bind") is None:
+            self.configure(bind=self._engine_factory())
+        return super().__call__(**local_kw)
 
-# 엔진 생성
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # SQLite 전용 설정
-)
 
 # 세션 팩토리 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = _LazySessionmaker(get_engine, autocommit=False, autoflush=False)
+ReadSessionLocal = _LazySessionmaker(get_read_engine, autocommit=False, autoflush=False)
+
+
+def __getattr__(name: str):
+    # 기존 코드 호환용: app.db.session.engine / read_engine 접근 시 엔진 생성
+    if name == "engine":
+        return get_engine()
+    if name == "read_engine":
+        return get_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def get_db() -> Session:
+def get_write_db() -> Session:
     """
-    FastAPI 의존성 주입을 위한 데이터베이스 세션 제공자
+    FastAPI 의존성 주입을 위한 데이터베이스 세션 제공자 (쓰기용 풀)
     """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db() -> Session:
+    """
+    조회 전용 엔드포인트를 위한 데이터베이스 세션 제공자 (읽기 전용 풀)
+
+    PostgreSQL 복제본을 사용하는 경우 방금 저장한 데이터가 복제 지연만큼 늦게 보일 수 있습니다.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# 기존 코드 호환용 (쓰기용 세션)
+get_db = get_write_db
+
+def warm_up_db() -> None:
+    """
+    서버 시작 시 커넥션 풀에 연결을 하나 만들어 두어 첫 요청의 연결 지연을 없앱니다.
+    """
+    engine, read_engine = _get_engines()
+    for target in (engine, read_engine):
+        if target is read_engine and read_engine is engine:
+            continue
+        with target.connect() as conn:
+            conn.execute(text("SELECT 1"))
@@ -1,9 +1,37 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
-from app.api import analyze, emr
+from app.api import analytics, analyze, emr, live
+from app.config import settings
+from app.db.profiler import SQLProfilerMiddleware
+from app.db.init_db import init_db
+from app.db.session import warm_up_db
+from app.services import llm_service
+from app.services.job_queue import get_job_queue
+from app.services.patient_search import get_patient_search_index
+from app.services.metrics import MetricsMiddleware, render_metrics
 
-app = FastAPI()
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 작업 큐 테이블이 없는 기존 DB를 위해 테이블 생성 (이미 있으면 건너뜀)
+    init_db()
+    # 모듈 import 시에는 만들지 않은 DB 연결과 LLM 클라이언트를 첫 요청 전에 준비
+    if settings.WARM_UP_ON_STARTUP:
+        warm_up_db()
+        llm_service.warm_up()
+    # 환자 검색 인덱스 생성 (이후 저장/삭제는 patient_changes로 반영)
+    get_patient_search_index().build()
+    # 백그라운드 분석 워커 시작 (미완료 작업은 DB에서 이어서 처리)
+    get_job_queue().start()
+    yield
+    get_job_queue().stop()
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정
 app.add_middleware(
@@ -25,11 +53,31 @@ app.add_middleware(
     max_age=3600,  # 프리플라이트 요청 캐시 시간
 )
 
+# 라우트별 처리 시간, 요청당 SQL 통계 수집
+app.add_middleware(MetricsMiddleware)
+
+# 요청별 SQL 프로파일링 (느린 쿼리/N+1 로그, X-SQL-Profile 응답 헤더)
+# 미들웨어 스택은 첫 요청(lifespan) 때 만들어지므로, 설정도 import 시점이 아니라 그때 읽음
+def sql_profiler(app):
+    if not settings.SQL_PROFILE_ENABLED:
+        return app
+    return SQLProfilerMiddleware(app, n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD)
+
+app.add_middleware(sql_profiler)
+
 # 헬스체크 엔드포인트
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
+# Prometheus 지표 엔드포인트
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    data, content_type = render_metrics()
+    return Response(content=data, media_type=content_type)
+
 # 라우터 등록
 app.include_router(analyze.router, prefix="/analyze", tags=["analyze"])
+app.include_router(live.router, prefix="/analyze", tags=["analyze"])
 app.include_router(emr.router, prefix="/emr", tags=["emr"])
+app.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, Date, PrimaryKeyConstraint, Index
+
+from app.models.emr import Base
+
+# 통계용 집계 테이블 (save_emr와 삭제 API에서 증분 갱신, scripts/rebuild_rollups.py로 전체 재계산)
+# 대시보드 조회는 원본 기록이 아닌 이 테이블만 읽으므로 기록이 쌓여도 조회 비용이 늘지 않음
+
+# 집계 항목 종류 (code 컬럼의 의미)
+ROLLUP_KINDS = ("diagnosis", "severity", "observation", "medication")
+
+class DailyEncounterRollup(Base):
+    __tablename__ = "rollup_daily_encounters"
+
+    day = Column(Date, primary_key=True)  # 진료 생성일 (UTC)
+    encounters = Column(Integer, nullable=False, default=0)  # 진료 수
+
+class DailyCodeRollup(Base):
+    __tablename__ = "rollup_daily_codes"
+
+    day = Column(Date, nullable=False)
+    kind = Column(String, nullable=False)  # diagnosis | severity | observation | medication
+    code = Column(String, nullable=False)  # 진단명, 중증도, 관찰 항목명, 약물명
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("kind", "code", "day"),  # 항목별 일별 추이
+        Index("ix_rollup_daily_codes_kind_day", "kind", "day"),  # 기간별 상위 항목
+    )
+
+class CodeTotalRollup(Base):
+    __tablename__ = "rollup_code_totals"
+
+    kind = Column(String, nullable=False)
+    code = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)  # 전체 기간 누적 수
+
+    __table_args__ = (
+        PrimaryKeyConstraint("kind", "code"),
+    )
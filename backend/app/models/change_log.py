@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+
+from app.models.emr import Base
+
+class PatientChange(Base):
+    """
+    환자 정보 변경 기록입니다.
+
+    각 워커의 메모리 검색 인덱스(patient_search)가 마지막으로 반영한 id 이후의 변경만 읽어
+    다른 워커에서 저장/삭제된 환자를 반영합니다.
+    """
+    __tablename__ = "patient_changes"
+    # 오래된 기록을 지운 뒤에도 id가 재사용되지 않도록 AUTOINCREMENT 사용 (SQLite)
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True)
+    patient_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)  # upsert | delete
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey, JSON, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, Text, ForeignKey, JSON, Enum, Boolean, Computed, Index
 from sqlalchemy.orm import relationship, declarative_base
 import enum
 from datetime import datetime
@@ -47,7 +47,7 @@ class Encounter(Base):
     meta = Column(JSON)
     
     # 필수 정보
-    patient_id = Column(Integer, ForeignKey("patients.id"))
+    patient_id = Column(Integer, ForeignKey("patients.id"), index=True)
     status = Column(String)  # planned | arrived | triaged | in-progress | finished | cancelled
     class_ = Column(String)  # Column name 'class_' to avoid Python keyword conflict
     type = Column(String)
@@ -77,8 +77,10 @@ class Condition(Base):
     meta = Column(JSON)
     
     # 필수 정보
-    encounter_id = Column(Integer, ForeignKey("encounters.id"))
+    encounter_id = Column(Integer, ForeignKey("encounters.id"), index=True)
     code = Column(JSON)  # { "code": "코드", "system": "코드체계", "display": "표시명" }
+    # 진단명 검색용 생성 컬럼 (code.text, DB가 자동 계산)
+    code_text = Column(String, Computed(code["text"].as_string(), persisted=True))
     clinical_status = Column(String)  # active | recurrence | inactive | remission | resolved
     verification_status = Column(String)  # unconfirmed | provisional | differential | confirmed
     
@@ -98,6 +100,11 @@ class Condition(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_conditions_code_text_severity", "code_text", "severity"),
+        Index("ix_conditions_severity", "severity"),
+    )
+
 class Observation(Base):
     __tablename__ = "observations"
     
@@ -107,9 +114,11 @@ class Observation(Base):
     meta = Column(JSON)
     
     # 필수 정보
-    encounter_id = Column(Integer, ForeignKey("encounters.id"))
+    encounter_id = Column(Integer, ForeignKey("encounters.id"), index=True)
     status = Column(String)  # registered | preliminary | final | amended
     code = Column(JSON)  # { "code": "코드", "system": "코드체계", "display": "관찰항목명" }
+    # 관찰 항목명 검색용 생성 컬럼 (code.text)
+    code_text = Column(String, Computed(code["text"].as_string(), persisted=True), index=True)
     
     # 관찰 값
     value_quantity = Column(JSON)  # { "value": 수치, "unit": "단위", "system": "단위체계" }
@@ -136,9 +145,11 @@ class MedicationStatement(Base):
     meta = Column(JSON)
     
     # 필수 정보
-    encounter_id = Column(Integer, ForeignKey("encounters.id"))
+    encounter_id = Column(Integer, ForeignKey("encounters.id"), index=True)
     status = Column(String)  # active | completed | entered-in-error | intended | stopped | on-hold
     medication = Column(JSON)  # { "code": "약품코드", "system": "코드체계", "display": "약품명" }
+    # 약물명 검색용 생성 컬럼 (medication.text)
+    medication_text = Column(String, Computed(medication["text"].as_string(), persisted=True), index=True)
     
     # 투약 정보
     dosage = Column(JSON)  # {
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, Index
+import enum
+from datetime import datetime
+
+from app.models.emr import Base
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+    cancelled = "cancelled"
+
+# 더 이상 상태가 바뀌지 않는 종료 상태
+TERMINAL_JOB_STATUSES = (JobStatus.succeeded, JobStatus.failed, JobStatus.cancelled)
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # 작업 내용
+    text = Column(Text, nullable=False)  # 분석할 대화 내용
+    priority = Column(Integer, default=0, nullable=False)  # 높을수록 먼저 처리
+    status = Column(String, default=JobStatus.queued.value, nullable=False)
+
+    # 결과
+    result = Column(JSON)  # analyze_with_llm 결과
+    error = Column(Text)  # 실패 사유
+
+    # 실행 정보
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    worker_id = Column(String)  # 작업을 점유한 워커
+    lease_expires_at = Column(DateTime)  # 점유 만료 시각 (워커 비정상 종료 시 재할당 기준)
+    available_at = Column(DateTime)  # 재시도 대기 중인 작업을 처리할 수 있는 시각 (없으면 즉시)
+
+    # 메타데이터
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # 대기열 조회 (status = 'queued' ORDER BY priority DESC, id)
+        Index("ix_analysis_jobs_status_priority", "status", "priority", "id"),
+    )
@@ -0,0 +1,15 @@
+from datetime import date
+from pydantic import BaseModel
+
+# 통계 API 응답 스키마
+class DailyEncounterCount(BaseModel):
+    day: date
+    encounters: int
+
+class CodeCount(BaseModel):
+    code: str
+    count: int
+
+class DailyCodeCount(BaseModel):
+    day: date
+    count: int
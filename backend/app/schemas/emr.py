@@ -89,6 +89,10 @@ class EMRSaveResponse(BaseModel):
     patient_id: int
     encounter_id: int
 
+class CohortCountResponse(BaseModel):
+    patients: int
+    encounters: int
+
 class EMRRecord(BaseModel):
     encounter: EncounterResponse
     conditions: List[ConditionResponse] = []
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+
+from app.schemas.emr import model_config_with_json_encoders
+
+# 요청 스키마
+class AnalysisJobCreateRequest(BaseModel):
+    text: str
+    priority: int = Field(default=0, ge=-100, le=100)  # 높을수록 먼저 처리
+
+# 응답 스키마
+class AnalysisJobResponse(BaseModel):
+    id: int
+    status: str
+    priority: int
+    attempts: int
+    available_at: Optional[datetime] = None  # 재시도 대기 중이면 다음 시도 시각
+    cancel_requested: bool
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_config = model_config_with_json_encoders
@@ -0,0 +1,81 @@
+from typing import Optional, List, Dict, Any, Literal
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+# LLM 출력의 리소스(섹션)별 검증 스키마
+# 검증은 섹션 단위로 수행하여, 일부 섹션만 잘못된 경우 해당 섹션만 다시 요청합니다.
+
+# 축약(compact) 형식
+class CompactPatient(BaseModel):
+    n: Optional[str] = None
+    b: Optional[str] = None
+    g: Optional[str] = None
+
+class CompactCondition(BaseModel):
+    dx: str
+    on: Optional[str] = None
+    sv: Optional[Literal["mild", "moderate", "severe"]] = None
+
+class CompactObservation(BaseModel):
+    k: str
+    v: Optional[str] = None
+
+class CompactMedication(BaseModel):
+    n: str
+    d: Optional[str] = None
+    s: Optional[str] = None
+    st: Optional[str] = None
+
+COMPACT_SECTION_VALIDATORS: Dict[str, TypeAdapter] = {
+    "p": TypeAdapter(CompactPatient),
+    "r": TypeAdapter(Optional[str]),
+    "c": TypeAdapter(Optional[CompactCondition]),
+    "o": TypeAdapter(List[CompactObservation]),
+    "m": TypeAdapter(List[CompactMedication]),
+}
+
+# 기존(full) FHIR-유사 형식
+class _Section(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+class TextValue(_Section):
+    text: Optional[str] = None
+
+class RequiredTextValue(_Section):
+    text: str
+
+class PatientSection(_Section):
+    name: Optional[TextValue] = None
+    birth_date: Optional[str] = None
+    gender: Optional[str] = None
+
+class EncounterSection(_Section):
+    status: Optional[str] = None
+    type: Optional[str] = None
+    period: Optional[Dict[str, Any]] = None
+    reason_text: Optional[str] = None
+
+class ConditionSection(_Section):
+    code: RequiredTextValue
+    clinical_status: Optional[str] = None
+    verification_status: Optional[str] = None
+    onset_datetime: Optional[str] = None
+    severity: Optional[str] = None
+
+class ObservationSection(_Section):
+    code: RequiredTextValue
+    status: Optional[str] = None
+    value_string: Optional[str] = None
+
+class MedicationStatementSection(_Section):
+    medication: RequiredTextValue
+    status: Optional[str] = None
+    dosage: Optional[TextValue] = None
+    effective_period: Optional[Dict[str, Any]] = None
+
+FULL_SECTION_VALIDATORS: Dict[str, TypeAdapter] = {
+    "Patient": TypeAdapter(PatientSection),
+    "Encounter": TypeAdapter(EncounterSection),
+    "Condition": TypeAdapter(ConditionSection),
+    "Observation": TypeAdapter(List[ObservationSection]),
+    "MedicationStatement": TypeAdapter(List[MedicationStatementSection]),
+}
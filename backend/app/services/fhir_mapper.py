@@ -35,6 +35,66 @@ class FHIRMapper:
             return None
         return dt.isoformat()
 
+    def expand_compact(self, compact: Dict[str, Any], current_time: str) -> Dict[str, Any]:
+        """
+        LLM의 축약 출력(짧은 키, 상수 필드 생략)을 기존 FHIR-유사 JSON 구조로 복원합니다.
+
+        축약 형식: {"p": {"n", "b", "g"}, "r", "c": {"dx", "on", "sv"}, "o": [{"k", "v"}], "m": [{"n", "d", "s", "st"}]}
+        진료 상태, 진료 구분 등 항상 같은 값인 필드와 시간 필드는 여기서 채웁니다.
+        값이 없는 텍스트 필드는 생략하여 map_sub_resources의 기본값이 적용되도록 합니다.
+        """
+        def text(value: Optional[str]) -> Dict[str, str]:
+            return {"text": value} if value else {}
+
+        patient = compact.get("p") or {}
+        result: Dict[str, Any] = {
+            "Patient": {
+                "name": text(patient.get("n")),
+                "birth_date": patient.get("b"),
+                "gender": patient.get("g"),
+            },
+            "Encounter": {
+                "status": "finished",
+                "class": "AMB",
+                "type": "진료",
+                "period": {"start": current_time},
+                "reason_text": compact.get("r"),
+            },
+        }
+
+        condition = compact.get("c")
+        if isinstance(condition, dict):
+            result["Condition"] = {
+                "clinical_status": "active",
+                "verification_status": "provisional",
+                "code": text(condition.get("dx")),
+                "onset_datetime": condition.get("on"),
+                "severity": condition.get("sv") or "moderate",
+            }
+
+        result["Observation"] = [
+            {
+                "status": "final",
+                "code": text(obs.get("k")),
+                "value_string": obs.get("v") or "",
+                "effective_datetime": current_time,
+            }
+            for obs in compact.get("o") or []
+            if isinstance(obs, dict)
+        ]
+
+        result["MedicationStatement"] = [
+            {
+                "status": med.get("st") or "active",
+                "medication": text(med.get("n")),
+                "dosage": text(med.get("d")),
+                "effective_period": {"start": med.get("s")} if med.get("s") else {},
+            }
+            for med in compact.get("m") or []
+            if isinstance(med, dict)
+        ]
+        return result
+
     def map_patient_data(self, llm_result: Dict[str, Any]) -> Dict[str, Any]:
         """LLM 결과에서 Patient 정보를 추출하여 DB 모델 형식으로 매핑합니다."""
         patient_data = llm_result.get("Patient", {})
@@ -105,10 +165,11 @@ class FHIRMapper:
                 for med in med_list:
                     effective_period = med.get("effective_period", {})
                     if isinstance(effective_period, dict):
+                        # JSON 컬럼에 저장되므로 Encounter.period와 같이 ISO 문자열로 정규화
                         if "start" in effective_period:
-                            effective_period["start"] = self._to_datetime(effective_period["start"])
+                            effective_period["start"] = self._datetime_to_str(self._to_datetime(effective_period["start"]))
                         if "end" in effective_period:
-                            effective_period["end"] = self._to_datetime(effective_period["end"])
+                            effective_period["end"] = self._datetime_to_str(self._to_datetime(effective_period["end"]))
                     else:
                         effective_period = {"start": None, "end": None}
 
@@ -0,0 +1,299 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.models.job import AnalysisJob, JobStatus, TERMINAL_JOB_STATUSES
+from app.services.llm_admission import AdmissionRejected
+from app.services.llm_service import analyze_with_llm, LLMRequestFailed
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    데이터베이스에 영속화되는 분석 작업 큐입니다.
+
+    작업은 analysis_jobs 테이블에 저장되므로 프로세스가 재시작되어도 유실되지 않습니다.
+    각 프로세스는 워커 스레드 풀을 실행하며, 조건부 UPDATE로 작업을 점유하기 때문에
+    여러 uvicorn 워커가 같은 테이블을 공유해도 하나의 작업은 한 워커만 처리합니다.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        poll_interval: float,
+        lease_seconds: int,
+        max_attempts: int,
+        retry_backoff: float = 5.0,
+        retry_backoff_max: float = 300.0,
+    ):
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self._worker_prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    # ------------------------------------------------------------------
+    # 클라이언트 API
+    # ------------------------------------------------------------------
+    def submit(self, db: Session, text: str, priority: int = 0) -> AnalysisJob:
+        """새 분석 작업을 대기열에 추가합니다."""
+        job = AnalysisJob(
+            text=text,
+            priority=priority,
+            status=JobStatus.queued.value,
+            max_attempts=self.max_attempts,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        self._wakeup.set()
+        return job
+
+    def cancel(self, db: Session, job: AnalysisJob) -> AnalysisJob:
+        """
+        작업을 취소합니다.
+
+        대기 중인 작업은 즉시 취소되고, 실행 중인 작업은 취소 요청만 기록되어
+        LLM 호출이 끝난 뒤 결과를 버리고 취소 상태로 종료됩니다.
+        """
+        if job.status == JobStatus.queued.value:
+            updated = (
+                db.query(AnalysisJob)
+                .filter(AnalysisJob.id == job.id, AnalysisJob.status == JobStatus.queued.value)
+                .update(
+                    {
+                        AnalysisJob.status: JobStatus.cancelled.value,
+                        AnalysisJob.cancel_requested: True,
+                        AnalysisJob.finished_at: datetime.utcnow(),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            if not updated:
+                # 그 사이 워커가 작업을 가져간 경우 실행 중 취소로 처리
+                db.query(AnalysisJob).filter(AnalysisJob.id == job.id).update(
+                    {AnalysisJob.cancel_requested: True}, synchronize_session=False
+                )
+        elif job.status == JobStatus.running.value:
+            job.cancel_requested = True
+        db.commit()
+        db.refresh(job)
+        return job
+
+    # ------------------------------------------------------------------
+    # 워커 수명 주기
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """워커 스레드를 시작합니다."""
+        if self._threads:
+            return
+        if self.num_workers and not settings.llm_configured:
+            # 등록된 작업은 설정이 있는 다른 프로세스의 워커가 처리할 수 있도록 대기 상태로 둠
+            logger.warning("Azure OpenAI 설정이 없어 분석 작업 워커를 시작하지 않습니다.")
+            return
+        self._stopping.clear()
+        for i in range(self.num_workers):
+            thread = threading.Thread(
+                target=self._run_worker,
+                args=(f"{self._worker_prefix}:{i}",),
+                name=f"analysis-job-worker-{i}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"분석 작업 워커 {self.num_workers}개를 시작했습니다.")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        워커 스레드를 정지합니다.
+
+        실행 중인 LLM 호출은 중단하지 않습니다. 정지 시간 안에 끝나지 않은 작업은
+        점유가 만료된 뒤 다른 워커(또는 재시작된 프로세스)가 다시 가져갑니다.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _run_worker(self, worker_id: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = self.process_next(worker_id)
+            except Exception as e:
+                logger.error(f"작업 워커 오류 ({worker_id}): {e}", exc_info=True)
+                processed = False
+            if not processed:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    # ------------------------------------------------------------------
+    # 작업 처리
+    # ------------------------------------------------------------------
+    def requeue_expired(self, db: Session) -> int:
+        """점유가 만료된 실행 중 작업을 다시 대기열로 돌려놓습니다."""
+        now = datetime.utcnow()
+        expired = (
+            db.query(AnalysisJob)
+            .filter(
+                AnalysisJob.status == JobStatus.running.value,
+                AnalysisJob.lease_expires_at < now,
+            )
+            .all()
+        )
+        for job in expired:
+            if job.cancel_requested:
+                job.status = JobStatus.cancelled.value
+                job.finished_at = now
+            elif job.attempts >= job.max_attempts:
+                job.status = JobStatus.failed.value
+                job.error = job.error or "작업 처리 시간이 초과되었습니다."
+                job.finished_at = now
+            else:
+                job.status = JobStatus.queued.value
+            job.worker_id = None
+            job.lease_expires_at = None
+        if expired:
+            db.commit()
+            logger.warning(f"점유가 만료된 작업 {len(expired)}건을 재처리합니다.")
+        return len(expired)
+
+    def claim_next(self, db: Session, worker_id: str) -> Optional[AnalysisJob]:
+        """우선순위가 가장 높은 대기 작업 하나를 점유합니다."""
+        self.requeue_expired(db)
+
+        while True:
+            # 재시도 대기 중인 작업(available_at이 아직 오지 않음)은 건너뜀
+            candidate_id = (
+                db.query(AnalysisJob.id)
+                .filter(
+                    AnalysisJob.status == JobStatus.queued.value,
+                    or_(AnalysisJob.available_at.is_(None), AnalysisJob.available_at <= datetime.utcnow()),
+                )
+                .order_by(AnalysisJob.priority.desc(), AnalysisJob.id)
+                .limit(1)
+                .scalar()
+            )
+            if candidate_id is None:
+                return None
+
+            now = datetime.utcnow()
+            # 다른 워커가 먼저 가져갔다면 status 조건에 걸려 0건이 갱신됨
+            claimed = (
+                db.query(AnalysisJob)
+                .filter(AnalysisJob.id == candidate_id, AnalysisJob.status == JobStatus.queued.value)
+                .update(
+                    {
+                        AnalysisJob.status: JobStatus.running.value,
+                        AnalysisJob.worker_id: worker_id,
+                        AnalysisJob.attempts: AnalysisJob.attempts + 1,
+                        AnalysisJob.started_at: now,
+                        AnalysisJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if claimed:
+                return db.query(AnalysisJob).filter(AnalysisJob.id == candidate_id).first()
+
+    def process_next(self, worker_id: str) -> bool:
+        """대기 작업 하나를 처리합니다. 처리할 작업이 없으면 False를 반환합니다."""
+        db = SessionLocal()
+        try:
+            job = self.claim_next(db, worker_id)
+            if job is None:
+                return False
+
+            logger.info(f"분석 작업 {job.id} 처리를 시작합니다. (시도 {job.attempts}/{job.max_attempts})")
+            retry_after = None
+            retryable = True
+            try:
+                result = analyze_with_llm(job.text)
+                error = None
+            except AdmissionRejected as e:
+                result = None
+                error = None
+                retry_after = e.retry_after
+            except ValueError as e:
+                # 응답 해석 실패 등은 같은 입력으로 다시 시도해도 결과가 같으므로 바로 실패 처리 (LLM 호출 실패만 재시도)
+                result = None
+                error = str(e)
+                retryable = isinstance(e, LLMRequestFailed)
+            except Exception as e:
+                result = None
+                error = str(e)
+
+            db.refresh(job)
+            if job.worker_id != worker_id:
+                # 점유가 만료되어 다른 워커에 재할당된 작업
+                logger.warning(f"분석 작업 {job.id}의 점유가 만료되어 결과를 버립니다.")
+                return True
+
+            now = datetime.utcnow()
+            if job.cancel_requested:
+                job.status = JobStatus.cancelled.value
+            elif retry_after is not None:
+                # LLM 한도 초과는 작업 실패가 아니므로 시도 횟수를 되돌리고 대기열로 반환
+                job.status = JobStatus.queued.value
+                job.attempts -= 1
+                logger.info(f"LLM 한도 초과로 분석 작업 {job.id}을 {retry_after:.0f}초 후 재시도합니다.")
+            elif error is None:
+                job.status = JobStatus.succeeded.value
+                job.result = result
+                job.error = None
+            elif not retryable or job.attempts >= job.max_attempts:
+                job.status = JobStatus.failed.value
+                job.error = error
+            else:
+                # 일시적인 오류일 수 있으므로 시도할 때마다 2배씩 늘어나는 시간 뒤에 다시 처리
+                delay = min(self.retry_backoff * 2 ** (job.attempts - 1), self.retry_backoff_max)
+                job.status = JobStatus.queued.value
+                job.error = error
+                job.available_at = now + timedelta(seconds=delay)
+                logger.warning(f"분석 작업 {job.id} 실패, {delay:.0f}초 후 재시도합니다: {error}")
+
+            if job.status in [s.value for s in TERMINAL_JOB_STATUSES]:
+                job.finished_at = now
+            job.worker_id = None
+            job.lease_expires_at = None
+            db.commit()
+            logger.info(f"분석 작업 {job.id} 상태: {job.status}")
+            if retry_after is not None:
+                # 한도가 회복될 때까지 이 워커는 새 작업을 가져가지 않음
+                self._stopping.wait(retry_after)
+            return True
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+@lru_cache
+def get_job_queue() -> JobQueue:
+    """프로세스의 작업 큐를 반환합니다 (처음 호출될 때 설정을 읽어 생성)."""
+    return JobQueue(
+        num_workers=settings.JOB_WORKERS,
+        poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        retry_backoff=settings.JOB_RETRY_BACKOFF_SECONDS,
+        retry_backoff_max=settings.JOB_RETRY_BACKOFF_MAX_SECONDS,
+    )
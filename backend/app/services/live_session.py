@@ -0,0 +1,96 @@
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# 리스트 리소스에서 같은 항목을 식별하는 키 (새 항목은 추가, 같은 키는 갱신)
+LIST_RESOURCE_KEYS = {
+    "Observation": ("code", "text"),
+    "MedicationStatement": ("medication", "text"),
+}
+
+
+def _deep_merge(base: Dict[str, Any], changes: Dict[str, Any]) -> Dict[str, Any]:
+    """changes의 값으로 base를 갱신합니다. None 값은 기존 값을 지우지 않습니다."""
+    merged = dict(base)
+    for key, value in changes.items():
+        if value is None:
+            continue
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _item_key(item: Dict[str, Any], path: tuple[str, str]) -> Optional[str]:
+    outer = item.get(path[0])
+    if isinstance(outer, dict):
+        return outer.get(path[1])
+    return None
+
+
+def merge_analysis(state: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    증분 분석 결과(delta)를 현재 분석 결과(state)에 병합한 새 결과를 반환합니다.
+
+    Patient/Encounter/Condition은 필드 단위로 덮어쓰고, Observation/MedicationStatement는
+    code.text/medication.text가 같은 항목을 갱신하거나 새 항목으로 추가합니다.
+    """
+    merged = copy.deepcopy(state)
+    for resource, value in delta.items():
+        if resource in LIST_RESOURCE_KEYS and isinstance(value, list):
+            path = LIST_RESOURCE_KEYS[resource]
+            items: List[Dict[str, Any]] = merged.setdefault(resource, [])
+            index = {_item_key(item, path): i for i, item in enumerate(items)}
+            for change in value:
+                if not isinstance(change, dict):
+                    continue
+                key = _item_key(change, path)
+                if key is not None and key in index:
+                    items[index[key]] = _deep_merge(items[index[key]], change)
+                else:
+                    index[key] = len(items)
+                    items.append(copy.deepcopy(change))
+        elif isinstance(value, dict) and isinstance(merged.get(resource), dict):
+            merged[resource] = _deep_merge(merged[resource], value)
+        elif value is not None:
+            merged[resource] = copy.deepcopy(value)
+    return merged
+
+
+@dataclass
+class LiveSession:
+    """진행 중인 진료 대화의 발화 목록과 실시간 분석 상태입니다."""
+    turns: List[str] = field(default_factory=list)
+    analyzed_turns: int = 0  # 분석 결과에 반영된 발화 수
+    state: Dict[str, Any] = field(default_factory=dict)
+    version: int = 0  # 분석 결과가 갱신될 때마다 증가
+
+    def add_turns(self, turns: List[Dict[str, str]] | List[str]) -> None:
+        """발화를 추가합니다. {"speaker": "의사", "text": "..."} 또는 "의사: ..." 형식을 받습니다."""
+        for turn in turns:
+            if isinstance(turn, dict):
+                text = (turn.get("text") or "").strip()
+                if not text:
+                    continue
+                speaker = (turn.get("speaker") or "").strip()
+                self.turns.append(f"{speaker}: {text}" if speaker else text)
+            elif isinstance(turn, str) and turn.strip():
+                self.turns.append(turn.strip())
+
+    @property
+    def pending_turns(self) -> int:
+        return len(self.turns) - self.analyzed_turns
+
+    def pending_text(self, upto: int) -> str:
+        """아직 분석에 반영되지 않은 발화를 upto번째까지 이어 붙입니다."""
+        return "\n".join(self.turns[self.analyzed_turns:upto])
+
+    def full_text(self) -> str:
+        return "\n".join(self.turns)
+
+    def apply(self, delta: Dict[str, Any], upto: int) -> None:
+        """upto번째 발화까지 분석한 증분 결과를 반영합니다."""
+        self.state = merge_analysis(self.state, delta)
+        self.analyzed_turns = upto
+        self.version += 1
@@ -0,0 +1,223 @@
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from app.config import settings
+from app.services.metrics import LLM_ADMISSION_QUEUE_DEPTH, LLM_ADMISSION_WAIT_SECONDS, LLM_ADMISSION_REJECTED
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str | None) -> int:
+    """
+    문자열의 토큰 수를 근사합니다.
+
+    토크나이저 없이 빠르게 계산하기 위해, 한글 등 비ASCII 문자는 글자당 1토큰,
+    ASCII 문자는 4글자당 1토큰으로 계산합니다. 실제 토큰 수보다 약간 크게 나오도록 잡았습니다.
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_chars = len(text) - non_ascii
+    return non_ascii + math.ceil(ascii_chars / 4)
+
+
+class AdmissionRejected(Exception):
+    """LLM 호출 한도를 초과하여 요청이 거절되었음을 나타냅니다."""
+
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(reason)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class TokenBucket:
+    """분당 한도(capacity)만큼 채워지는 토큰 버킷입니다. 잠금은 호출하는 쪽에서 관리합니다."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.refill_per_second = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated_at = now
+
+    def time_until(self, amount: float) -> float:
+        """amount만큼 사용 가능해질 때까지 남은 시간(초)을 반환합니다. refill 이후 호출해야 합니다."""
+        deficit = amount - self.tokens
+        if deficit <= 0:
+            return 0.0
+        return deficit / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+@dataclass
+class Reservation:
+    """admission 통과 시 예약된 토큰 양과 대기 시간입니다."""
+    tokens: int
+    waited: float
+
+
+class LLMAdmissionController:
+    """
+    Azure OpenAI의 TPM/RPM 한도에 맞춰 LLM 호출을 허용하는 admission control입니다.
+
+    요청마다 (예상 프롬프트 토큰 + max_tokens)를 예약하고, 한도를 넘으면 정해진 길이의
+    대기열에서 순서대로 기다립니다. 대기열이 가득 찼거나 예상 대기 시간이 최대 대기 시간을
+    넘으면 기다리지 않고 즉시 AdmissionRejected를 발생시킵니다.
+    호출이 끝나면 실제 사용량(completion.usage)과의 차이를 버킷에 돌려줍니다.
+
+    tpm/rpm은 배포 전체 한도입니다. 버킷은 프로세스마다 따로 있으므로, 같은 배포를 쓰는 서버 프로세스 수(processes)로
+    나눈 만큼만 이 프로세스에서 허용합니다.
+    """
+
+    def __init__(self, tpm: int, rpm: int, max_queue: int, max_wait: float, processes: int = 1):
+        self.enabled = tpm > 0 and rpm > 0
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.processes = max(1, processes)
+        self._tokens = TokenBucket(tpm / self.processes) if self.enabled else None
+        self._requests = TokenBucket(rpm / self.processes) if self.enabled else None
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[object, int]] = []
+
+        # 통계
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens.refill(now)
+        self._requests.refill(now)
+
+    def _time_until(self, tokens: int, requests: int) -> float:
+        return max(self._tokens.time_until(tokens), self._requests.time_until(requests))
+
+    def _estimate_wait(self, cost: int, now: float) -> float:
+        """앞선 대기 요청을 모두 처리한 뒤 cost를 처리할 수 있을 때까지의 예상 시간입니다."""
+        self._refill(now)
+        queued_tokens = sum(c for _, c in self._waiters)
+        return self._time_until(queued_tokens + cost, len(self._waiters) + 1)
+
+    def _reject(self, retry_after: float, reason: str) -> None:
+        self.rejected_total += 1
+        LLM_ADMISSION_REJECTED.inc()
+        raise AdmissionRejected(retry_after=max(retry_after, 1.0), reason=reason)
+
+    def acquire(self, cost: int, max_wait: Optional[float] = None) -> Reservation:
+        """cost 토큰을 예약합니다. 한도 내에서 처리할 수 없으면 AdmissionRejected를 발생시킵니다."""
+        if not self.enabled:
+            return Reservation(tokens=0, waited=0.0)
+
+        max_wait = self.max_wait if max_wait is None else max_wait
+        # 버킷 크기보다 큰 요청은 영원히 통과할 수 없으므로 버킷 크기로 제한
+        cost = int(min(cost, self._tokens.capacity))
+        started = time.monotonic()
+
+        with self._cond:
+            self._refill(started)
+            if not self._waiters and self._time_until(cost, 1) == 0:
+                return self._admit(cost, started)
+
+            if len(self._waiters) >= self.max_queue:
+                self._reject(self._estimate_wait(cost, started), "LLM 요청 대기열이 가득 찼습니다.")
+
+            estimated = self._estimate_wait(cost, started)
+            if estimated > max_wait:
+                self._reject(estimated, "LLM 토큰 한도를 초과했습니다.")
+
+            waiter = (object(), cost)
+            self._waiters.append(waiter)
+            LLM_ADMISSION_QUEUE_DEPTH.inc()
+            deadline = started + max_wait
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    is_head = self._waiters[0] is waiter
+                    if is_head and self._time_until(cost, 1) == 0:
+                        return self._admit(cost, started)
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        # 자신을 대기열에서 뺀 뒤 남은 대기 요청 기준으로 재시도 시간을 계산
+                        self._leave(waiter)
+                        self._reject(self._estimate_wait(cost, now), "LLM 토큰 한도 대기 시간을 초과했습니다.")
+                    timeout = min(remaining, self._time_until(cost, 1)) if is_head else remaining
+                    self._cond.wait(timeout)
+            finally:
+                if waiter in self._waiters:
+                    self._leave(waiter)
+
+    def _leave(self, waiter: tuple[object, int]) -> None:
+        self._waiters.remove(waiter)
+        LLM_ADMISSION_QUEUE_DEPTH.dec()
+        self._cond.notify_all()
+
+    def _admit(self, cost: int, started: float) -> Reservation:
+        self._tokens.consume(cost)
+        self._requests.consume(1)
+        waited = time.monotonic() - started
+        self.admitted_total += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        LLM_ADMISSION_WAIT_SECONDS.observe(waited)
+        return Reservation(tokens=cost, waited=waited)
+
+    def settle(self, reservation: Reservation, actual_tokens: Optional[int]) -> None:
+        """실제 사용 토큰 수가 예약보다 적으면 차이를 버킷에 돌려줍니다 (호출 실패 시 actual_tokens=0으로 전부 반환)."""
+        if not self.enabled or actual_tokens is None:
+            return
+        unused = reservation.tokens - actual_tokens
+        if unused > 0:
+            with self._cond:
+                self._tokens.refund(unused)
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """대기열 길이, 대기 시간 등 현재 상태를 반환합니다."""
+        with self._cond:
+            now = time.monotonic()
+            if self.enabled:
+                self._refill(now)
+            return {
+                "enabled": self.enabled,
+                # 아래 값은 이 프로세스 기준 (배포 전체 허용량 = 프로세스별 한도 × processes)
+                "processes": self.processes,
+                "tokens_per_minute": int(self._tokens.capacity) if self._tokens else None,
+                "requests_per_minute": int(self._requests.capacity) if self._requests else None,
+                "queue_depth": len(self._waiters),
+                "max_queue": self.max_queue,
+                "available_tokens": int(self._tokens.tokens) if self._tokens else None,
+                "available_requests": int(self._requests.tokens) if self._requests else None,
+                "admitted_total": self.admitted_total,
+                "rejected_total": self.rejected_total,
+                "wait_seconds_avg": (self.wait_seconds_total / self.admitted_total) if self.admitted_total else 0.0,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+@lru_cache
+def get_llm_admission() -> LLMAdmissionController:
+    """프로세스의 admission controller를 반환합니다 (처음 호출될 때 설정을 읽어 생성)."""
+    return LLMAdmissionController(
+        tpm=settings.AZURE_TPM_LIMIT,
+        rpm=settings.AZURE_RPM_LIMIT,
+        max_queue=settings.LLM_ADMISSION_MAX_QUEUE,
+        max_wait=settings.LLM_ADMISSION_MAX_WAIT_SECONDS,
+        processes=settings.LLM_ADMISSION_PROCESSES,
+    )
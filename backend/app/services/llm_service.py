@@ -1,62 +1,70 @@
 import json
 import logging
 import re
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 
-from openai import AzureOpenAI
+from pydantic import TypeAdapter, ValidationError
 from app.config import settings
+from app.services.llm_admission import get_llm_admission, estimate_tokens, AdmissionRejected
+from app.services.metrics import (
+    LLM_REQUEST_SECONDS,
+    LLM_TOKENS,
+    LLM_JSON_REPAIRS,
+    LLM_FALLBACKS,
+    LLM_SECTION_INVALID,
+    LLM_SECTION_RETRIES,
+    LLM_SECTION_FALLBACKS,
+    TRANSCRIPT_TOKENS,
+)
+from app.schemas.llm import COMPACT_SECTION_VALIDATORS, FULL_SECTION_VALIDATORS
+from app.services.transcript_preprocessor import preprocess_transcript
+from app.services.fhir_mapper import FHIRMapper
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-client = AzureOpenAI(
-    api_key=settings.AZURE_API_KEY,
-    api_version=settings.AZURE_API_VERSION,
-    azure_endpoint=settings.AZURE_ENDPOINT
-)
+class LLMNotConfigured(RuntimeError):
+    """Azure OpenAI 설정이 없어 분석할 수 없을 때 발생합니다."""
 
-def clean_json_string(json_str: str) -> str:
-    """LLM이 생성한 JSON 문자열을 정리합니다."""
-    # 코드 블록 마커 제거
-    if "```json" in json_str:
-        json_str = json_str.split("```json")[-1]
-    if "```" in json_str:
-        json_str = json_str.split("```")[0]
-    
-    # 줄바꿈, 탭 정리
-    json_str = json_str.strip()
-    
-    # 후행 쉼표 제거 (배열과 객체 모두)
-    json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-    
-    # 누락된 쌍따옴표 추가
-    json_str = re.sub(r'([{,]\s*)(\w+)(\s*:)', r'\1"\2"\3', json_str)
-    
-    # 잘못된 작은따옴표를 큰따옴표로 변경
-    json_str = json_str.replace("'", '"')
-    
-    # 빈 값을 null로 변경
-    json_str = re.sub(r':\s*,', ': null,', json_str)
-    json_str = re.sub(r':\s*}', ': null}', json_str)
-    
-    return json_str
+class LLMRequestFailed(ValueError):
+    """
+    LLM 호출 자체가 실패했을 때(네트워크, 서버 오류 등) 발생합니다.
 
-def analyze_with_llm(text: str) -> Dict[str, Any]:
-    """대화 내용을 LLM으로 분석하여 구조화된 정보를 반환합니다."""
-    logger.info("대화 분석을 시작합니다.")
-    
-    try:
-        # 현재 시간을 미리 설정
-        current_time = datetime.utcnow().isoformat()
-        
-        completion = client.chat.completions.create(
-            model=settings.AZURE_DEPLOYMENT_NAME,
-            messages=[
-                {
-                    "role": "system",
-                    "content": """다음은 의사와 환자 간의 정신과 진료 대화입니다.  
+    응답 해석 실패(ValueError)와 달리 일시적일 수 있으므로 작업 큐에서는 시간을 두고 재시도합니다.
+    """
+
+# openai 패키지는 import 비용이 크므로 처음 사용할 때 import하고 클라이언트를 생성
+client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """AzureOpenAI 클라이언트를 반환합니다 (처음 호출될 때 생성)."""
+    global client
+    if client is None:
+        with _client_lock:
+            if client is None:
+                if not settings.llm_configured:
+                    raise LLMNotConfigured("Azure OpenAI 설정(AZURE_*)이 없어 대화를 분석할 수 없습니다.")
+                from openai import AzureOpenAI
+
+                client = AzureOpenAI(
+                    api_key=settings.AZURE_API_KEY,
+                    api_version=settings.AZURE_API_VERSION,
+                    azure_endpoint=settings.AZURE_ENDPOINT
+                )
+    return client
+
+def warm_up() -> None:
+    """서버 시작 시 LLM 클라이언트를 미리 생성합니다 (설정이 없으면 건너뜀)."""
+    if not settings.llm_configured:
+        logger.warning("Azure OpenAI 설정이 없어 분석 API를 사용할 수 없습니다.")
+        return
+    get_client()
+
+ANALYSIS_SYSTEM_PROMPT = """다음은 의사와 환자 간의 정신과 진료 대화입니다.  
 이 대화를 분석하여 진료 정보를 FHIR 리소스 구조에 맞는 JSON 형식으로 출력해 주세요.
 각 필드의 값은 대화 내용에 근거해야 하며, 추론이 필요한 경우 가장 가능성이 높은 값을 사용해 주세요.
 
@@ -92,72 +100,456 @@ def analyze_with_llm(text: str) -> Dict[str, Any]:
   - `effective_period.start`: 복용 시작일 (대화에서 유추)
 
 반드시 유효한 JSON 형식으로 출력해주세요. 모든 키는 큰따옴표(")로 감싸주세요."""
+ANALYSIS_SYSTEM_PROMPT_TOKENS = estimate_tokens(ANALYSIS_SYSTEM_PROMPT)
+
+# 축약 출력 형식: 짧은 키를 사용하고 항상 같은 값인 필드(status, class 등)는 생략.
+# FHIRMapper.expand_compact가 기존 구조로 복원하므로 /emr/save와 프론트엔드는 그대로 사용 가능
+COMPACT_SYSTEM_PROMPT = """다음은 의사와 환자 간의 정신과 진료 대화입니다.
+이 대화를 분석하여 진료 정보를 아래의 축약 JSON 형식으로 출력해 주세요.
+각 필드의 값은 대화 내용에 근거해야 하며, 추론이 필요한 경우 가장 가능성이 높은 값을 사용해 주세요.
+대화에서 알 수 없는 값은 null로 출력하세요.
+
+- `p`: 환자 정보 — `n`: 이름, `b`: 생년월일 (YYYY-MM-DD), `g`: 'male' 또는 'female'
+- `r`: 방문 이유 (환자가 주로 호소하는 문제)
+- `c`: 잠정 진단 — `dx`: 진단명 (예: "주요우울장애"), `on`: 증상 시작 시점 (ISO 8601), `sv`: 'mild' | 'moderate' | 'severe'
+- `o`: 증상, 상태, 행동 등 관찰 항목 배열 — `k`: 관찰 항목명 (예: "수면 문제"), `v`: 환자의 상태에 대한 구체적인 설명
+- `m`: 복용 중인 약물 배열 — `n`: 약물명 + 용량 (예: "프로작 20mg"), `d`: 복용 방법 (예: "아침 식후 1정"),
+  `s`: 복용 시작일, `st`: 복용 상태 (현재 복용 중이면 null, 중단했으면 'stopped', 복용 완료면 'completed')"""
+COMPACT_SYSTEM_PROMPT_TOKENS = estimate_tokens(COMPACT_SYSTEM_PROMPT)
+
+def _nullable(schema_type: str, **extra) -> Dict[str, Any]:
+    return {"type": [schema_type, "null"], **extra}
+
+COMPACT_OUTPUT_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": ["p", "r", "c", "o", "m"],
+    "properties": {
+        "p": {
+            "type": "object",
+            "additionalProperties": False,
+            "required": ["n", "b", "g"],
+            "properties": {
+                "n": _nullable("string"),
+                "b": _nullable("string"),
+                "g": _nullable("string", enum=["male", "female", None]),
+            },
+        },
+        "r": _nullable("string"),
+        "c": {
+            "type": ["object", "null"],
+            "additionalProperties": False,
+            "required": ["dx", "on", "sv"],
+            "properties": {
+                "dx": {"type": "string"},
+                "on": _nullable("string"),
+                "sv": {"type": "string", "enum": ["mild", "moderate", "severe"]},
+            },
+        },
+        "o": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["k", "v"],
+                "properties": {"k": {"type": "string"}, "v": {"type": "string"}},
+            },
+        },
+        "m": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["n", "d", "s", "st"],
+                "properties": {
+                    "n": {"type": "string"},
+                    "d": _nullable("string"),
+                    "s": _nullable("string"),
+                    "st": _nullable("string", enum=["stopped", "completed", None]),
+                },
+            },
+        },
+    },
+}
+COMPACT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "emr_compact", "strict": True, "schema": COMPACT_OUTPUT_SCHEMA},
+}
+
+# compact 키 → 리소스 이름 (로그와 지표의 section 라벨은 두 형식 모두 리소스 이름 사용)
+COMPACT_SECTION_NAMES = {"p": "Patient", "r": "Encounter", "c": "Condition", "o": "Observation", "m": "MedicationStatement"}
+
+# full 형식에서 응답에 없어도 되는 리소스 (있으면 검증, 응답이 잘린 경우에는 없으면 재요청)
+FULL_OPTIONAL_SECTIONS = frozenset({"Patient", "MedicationStatement"})
+
+def _compact_sections_response_format(keys: List[str]) -> Dict[str, Any]:
+    """지정한 compact 키만 요구하도록 좁힌 구조화 출력 스키마입니다."""
+    schema = {
+        **COMPACT_OUTPUT_SCHEMA,
+        "required": list(keys),
+        "properties": {key: COMPACT_OUTPUT_SCHEMA["properties"][key] for key in keys},
+    }
+    return {"type": "json_schema", "json_schema": {"name": "emr_compact_sections", "strict": True, "schema": schema}}
+
+def _compact_placeholders(current_time: str) -> Dict[str, Any]:
+    """재요청 후에도 얻지 못한 compact 섹션에 사용할 기본값입니다."""
+    return {
+        "p": {"n": "알 수 없음", "b": None, "g": None},
+        "r": "상담",
+        "c": {"dx": "상담 필요", "on": current_time, "sv": "moderate"},
+        "o": [{"k": "초기 상담", "v": "자세한 내용 파악 필요"}],
+        "m": [],
+    }
+
+def _full_placeholders(current_time: str) -> Dict[str, Any]:
+    """재요청 후에도 얻지 못한 full 형식 리소스에 사용할 기본값입니다."""
+    return {
+        "Patient": {
+            "name": {"text": "알 수 없음"},
+            "birth_date": None,
+            "gender": None
+        },
+        "Encounter": {
+            "status": "finished",
+            "class": "AMB",
+            "type": "진료",
+            "period": {"start": current_time},
+            "reason_text": "상담"
+        },
+        "Condition": {
+            "clinical_status": "active",
+            "verification_status": "provisional",
+            "code": {"text": "상담 필요"},
+            "onset_datetime": current_time,
+            "severity": "moderate"
+        },
+        "Observation": [{
+            "status": "final",
+            "code": {"text": "초기 상담"},
+            "value_string": "자세한 내용 파악 필요",
+            "effective_datetime": current_time
+        }],
+        "MedicationStatement": []
+    }
+
+INCREMENTAL_SYSTEM_PROMPT = """다음은 진행 중인 의사와 환자 간의 정신과 진료 대화를 실시간으로 정리하는 작업입니다.
+입력으로 `현재 결과`(지금까지의 대화를 FHIR 리소스 구조로 정리한 JSON)와 `새 대화`(그 이후에 추가된 발화)가 주어집니다.
+새 대화로 인해 추가되거나 바뀐 정보만 같은 구조의 JSON으로 출력해 주세요.
+
+- 바뀌지 않은 리소스와 필드는 출력하지 마세요. 변경 사항이 없으면 {}를 출력하세요.
+- **Patient**, **Encounter**, **Condition**: 바뀐 필드만 포함한 객체
+  (예: {"Condition": {"severity": "severe"}})
+- **Observation**: 새로 관찰되었거나 내용이 바뀐 항목만 포함한 배열. 기존 항목을 수정할 때는 `code.text`를 그대로 사용하세요.
+- **MedicationStatement**: 새로 언급되었거나 바뀐 약물만 포함한 배열. 기존 약물을 수정할 때는 `medication.text`를 그대로 사용하세요.
+  복용을 중단한 약물은 `status`를 'stopped'로 출력하세요.
+- 각 필드의 의미와 값은 다음과 같습니다: Patient(name.text, birth_date, gender), Encounter(reason_text),
+  Condition(clinical_status, verification_status, code.text, onset_datetime, severity),
+  Observation(status, code.text, value_string), MedicationStatement(status, medication.text, dosage.text, effective_period.start)
+
+반드시 유효한 JSON 형식으로 출력해주세요. 모든 키는 큰따옴표(")로 감싸주세요."""
+INCREMENTAL_SYSTEM_PROMPT_TOKENS = estimate_tokens(INCREMENTAL_SYSTEM_PROMPT)
+
+def clean_json_string(json_str: str) -> str:
+    """LLM이 생성한 JSON 문자열을 정리합니다."""
+    # 코드 블록 마커 제거
+    if "```json" in json_str:
+        json_str = json_str.split("```json")[-1]
+    if "```" in json_str:
+        json_str = json_str.split("```")[0]
+    
+    # 줄바꿈, 탭 정리
+    json_str = json_str.strip()
+    original = json_str
+    
+    # 후행 쉼표 제거 (배열과 객체 모두)
+    json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
+    
+    # 누락된 쌍따옴표 추가
+    json_str = re.sub(r'([{,]\s*)(\w+)(\s*:)', r'\1"\2"\3', json_str)
+    
+    # 잘못된 작은따옴표를 큰따옴표로 변경
+    json_str = json_str.replace("'", '"')
+    
+    # 빈 값을 null로 변경
+    json_str = re.sub(r':\s*,', ': null,', json_str)
+    json_str = re.sub(r':\s*}', ': null}', json_str)
+
+    if json_str != original:
+        LLM_JSON_REPAIRS.inc()
+    
+    return json_str
+
+fhir_mapper = FHIRMapper()
+
+@lru_cache
+def _preprocess_steps() -> tuple:
+    """TRANSCRIPT_PREPROCESS_STEPS에서 적용할 전처리 단계 목록을 읽습니다."""
+    return tuple(step.strip() for step in settings.TRANSCRIPT_PREPROCESS_STEPS.split(",") if step.strip())
+
+def _preprocess(text: str) -> str:
+    """LLM에 보내기 전 대화에서 간투사, 맞장구, 타임스탬프 등을 제거하고 전후 토큰 수를 기록합니다."""
+    result = preprocess_transcript(text, steps=_preprocess_steps())
+    TRANSCRIPT_TOKENS.labels("raw").inc(result.tokens_before)
+    TRANSCRIPT_TOKENS.labels("preprocessed").inc(result.tokens_after)
+    logger.info(
+        f"대화 전처리: 예상 토큰 {result.tokens_before} → {result.tokens_after} "
+        f"({result.reduction_ratio:.0%} 감소)"
+    )
+    return result.text
+
+def _complete(
+    system_prompt: str,
+    system_prompt_tokens: int,
+    user_content: str,
+    response_format: Dict[str, Any] | None = None,
+    max_tokens: int | None = None,
+) -> str:
+    """admission control과 지표 수집을 거쳐 LLM을 호출하고 응답 문자열을 반환합니다."""
+    llm_client = get_client()
+    max_tokens = max_tokens or settings.LLM_MAX_TOKENS
+    # 예상 프롬프트 토큰 + 최대 응답 토큰만큼 한도를 예약 (초과 시 AdmissionRejected)
+    estimated_cost = system_prompt_tokens + estimate_tokens(user_content) + max_tokens
+    reservation = get_llm_admission().acquire(estimated_cost)
+
+    started = time.perf_counter()
+    try:
+        completion = llm_client.chat.completions.create(
+            model=settings.AZURE_DEPLOYMENT_NAME,
+            messages=[
+                {
+                    "role": "system",
+                    "content": system_prompt
                 },
                 {
                     "role": "user",
-                    "content": text
+                    "content": user_content
                 }
             ],
             temperature=0.1,  # 일관된 출력을 위해 낮은 temperature 사용
-            max_tokens=2000,
+            max_tokens=max_tokens,
+            **({"response_format": response_format} if response_format else {}),
         )
-        
-        result_str = completion.choices[0].message.content
-        logger.info("LLM 응답 받음")
-        logger.debug(f"Raw LLM response: {result_str}")
-        
-        # JSON 문자열 정리
-        result_str = clean_json_string(result_str)
-        logger.debug(f"Cleaned JSON string: {result_str}")
-        
+    except Exception as e:
+        LLM_REQUEST_SECONDS.labels("error").observe(time.perf_counter() - started)
+        # 응답을 받지 못했으므로 예약한 토큰을 모두 돌려줌
+        get_llm_admission().settle(reservation, 0)
+        raise LLMRequestFailed(str(e)) from e
+    elapsed = time.perf_counter() - started
+    LLM_REQUEST_SECONDS.labels("success").observe(elapsed)
+
+    usage = getattr(completion, "usage", None)
+    if usage:
+        LLM_TOKENS.labels("prompt").inc(usage.prompt_tokens)
+        LLM_TOKENS.labels("completion").inc(usage.completion_tokens)
+    get_llm_admission().settle(reservation, usage.total_tokens if usage else None)
+
+    logger.info(
+        "LLM 응답 받음 (%.2f초, prompt %s / completion %s 토큰)",
+        elapsed,
+        usage.prompt_tokens if usage else "?",
+        usage.completion_tokens if usage else "?",
+    )
+    return completion.choices[0].message.content
+
+def _salvage_sections(raw: str, names: List[str]) -> Dict[str, Any]:
+    """
+    전체 JSON으로 파싱되지 않는 응답(잘림, 뒤쪽 문법 오류 등)에서 온전한 최상위 섹션만 꺼냅니다.
+
+    섹션 이름("Condition", "o" 등)은 응답 안에서 최상위 키로만 쓰이므로,
+    각 이름 뒤의 값을 하나씩 디코딩하여 성공한 것만 사용합니다.
+    """
+    decoder = json.JSONDecoder()
+    salvaged: Dict[str, Any] = {}
+    for name in names:
+        for match in re.finditer(r'"%s"\s*:\s*' % re.escape(name), raw):
+            try:
+                salvaged[name], _ = decoder.raw_decode(raw, match.end())
+                break
+            except json.JSONDecodeError:
+                continue
+    return salvaged
+
+def _parse_sections(
+    raw: str,
+    validators: Dict[str, TypeAdapter],
+    optional: frozenset = frozenset(),
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    응답을 섹션별로 검증하여 (통과한 섹션, 누락되었거나 잘못된 섹션 이름)을 반환합니다.
+
+    optional 섹션은 응답에 없어도 누락으로 보지 않지만, 응답이 잘려 섹션 단위로 복구한 경우에는
+    잘린 뒤쪽에 있었을 수 있으므로 복구하지 못한 섹션을 모두 누락으로 봅니다.
+    """
+    try:
+        parsed = json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.warning(f"JSON 파싱 실패, 섹션 단위로 복구합니다: {e}")
+        logger.debug(f"문제가 있는 JSON 문자열: {raw}")
+        parsed = _salvage_sections(raw, list(validators))
+        optional = frozenset()
+    if not isinstance(parsed, dict):
+        parsed = {}
+
+    sections: Dict[str, Any] = {}
+    invalid: List[str] = []
+    for name, validator in validators.items():
+        if name not in parsed:
+            if name not in optional:
+                invalid.append(name)
+            continue
         try:
-            result_dict = json.loads(result_str)
-            # 현재 시간으로 period.start와 effective_datetime 강제 설정
-            if "Encounter" in result_dict:
-                if "period" not in result_dict["Encounter"]:
-                    result_dict["Encounter"]["period"] = {}
-                result_dict["Encounter"]["period"]["start"] = current_time
+            validator.validate_python(parsed[name])
+        except ValidationError as e:
+            logger.warning(f"{name} 섹션 검증 실패: {e.error_count()}개 오류")
+            invalid.append(name)
+            continue
+        sections[name] = parsed[name]
+    return sections, invalid
+
+def _retry_sections(text: str, names: List[str], compact: bool) -> Dict[str, Any]:
+    """누락되었거나 잘못된 섹션만 다시 요청하고, 검증을 통과한 섹션을 반환합니다."""
+    LLM_SECTION_RETRIES.inc()
+    if compact:
+        labels = [COMPACT_SECTION_NAMES[name] for name in names]
+        system_prompt = COMPACT_SYSTEM_PROMPT + f"\n\n이번에는 다음 키만 출력하세요: {', '.join(names)}"
+        response_format = _compact_sections_response_format(names)
+        validators = {name: COMPACT_SECTION_VALIDATORS[name] for name in names}
+    else:
+        labels = names
+        system_prompt = ANALYSIS_SYSTEM_PROMPT + f"\n\n이번에는 다음 리소스만 출력하세요: {', '.join(names)}"
+        response_format = None
+        validators = {name: FULL_SECTION_VALIDATORS[name] for name in names}
+    logger.info(f"누락/오류 섹션 재요청: {', '.join(labels)}")
+
+    try:
+        result_str = _complete(
+            system_prompt,
+            estimate_tokens(system_prompt),
+            text,
+            response_format,
+            max_tokens=settings.LLM_SECTION_RETRY_MAX_TOKENS,
+        )
+    except (AdmissionRejected, LLMNotConfigured):
+        # 한도 초과(429)와 설정 누락(503)은 기본값으로 채우지 않고 그대로 전달
+        raise
+    except Exception as e:
+        # 첫 응답에서 얻은 섹션은 살리고, 나머지는 호출한 쪽에서 기본값으로 채움
+        logger.warning(f"섹션 재요청 실패: {e}")
+        return {}
+
+    if not compact:
+        result_str = clean_json_string(result_str)
+    sections, _ = _parse_sections(result_str, validators)
+    return sections
+
+def analyze_with_llm(text: str, preprocess: bool = True) -> Dict[str, Any]:
+    """
+    대화 내용을 LLM으로 분석하여 구조화된 정보를 반환합니다.
+
+    응답은 리소스(섹션)별로 검증합니다. 일부 섹션이 잘렸거나 잘못된 경우 올바른 섹션은 그대로 두고
+    해당 섹션만 한 번 더 요청하며, 그래도 얻지 못한 섹션만 기본값으로 채웁니다.
+    """
+    logger.info("대화 분석을 시작합니다.")
+    
+    try:
+        if preprocess:
+            text = _preprocess(text)
+
+        # 현재 시간을 미리 설정
+        current_time = datetime.utcnow().isoformat()
+
+        compact = settings.LLM_OUTPUT_FORMAT == "compact"
+        if compact:
+            result_str = _complete(COMPACT_SYSTEM_PROMPT, COMPACT_SYSTEM_PROMPT_TOKENS, text, COMPACT_RESPONSE_FORMAT)
+            logger.debug(f"Raw LLM response: {result_str}")
+            # 구조화 출력은 스키마를 따르므로 정리 없이 파싱 (잘린 응답은 섹션 단위로 복구)
+            sections, invalid = _parse_sections(result_str, COMPACT_SECTION_VALIDATORS)
+        else:
+            result_str = _complete(ANALYSIS_SYSTEM_PROMPT, ANALYSIS_SYSTEM_PROMPT_TOKENS, text)
+            logger.debug(f"Raw LLM response: {result_str}")
+            # JSON 문자열 정리
+            result_str = clean_json_string(result_str)
+            logger.debug(f"Cleaned JSON string: {result_str}")
+            sections, invalid = _parse_sections(result_str, FULL_SECTION_VALIDATORS, FULL_OPTIONAL_SECTIONS)
 
-            if "Observation" in result_dict and isinstance(result_dict["Observation"], list):
-                for obs in result_dict["Observation"]:
-                    obs["effective_datetime"] = current_time
+        label = (lambda name: COMPACT_SECTION_NAMES[name]) if compact else (lambda name: name)
+        for name in invalid:
+            LLM_SECTION_INVALID.labels(label(name)).inc()
 
+        if invalid and settings.LLM_SECTION_RETRY:
+            sections.update(_retry_sections(text, invalid, compact))
+            invalid = [name for name in invalid if name not in sections]
+
+        if invalid:
+            logger.error(f"기본값으로 채운 섹션: {', '.join(label(name) for name in invalid)}")
+            placeholders = _compact_placeholders(current_time) if compact else _full_placeholders(current_time)
+            for name in invalid:
+                LLM_SECTION_FALLBACKS.labels(label(name)).inc()
+                sections[name] = placeholders[name]
+
+        result_dict = fhir_mapper.expand_compact(sections, current_time) if compact else sections
+
+        # 현재 시간으로 period.start와 effective_datetime 강제 설정
+        if "Encounter" in result_dict:
+            if not isinstance(result_dict["Encounter"].get("period"), dict):
+                result_dict["Encounter"]["period"] = {}
+            result_dict["Encounter"]["period"]["start"] = current_time
+
+        if "Observation" in result_dict and isinstance(result_dict["Observation"], list):
+            for obs in result_dict["Observation"]:
+                obs["effective_datetime"] = current_time
+
+        if invalid:
+            logger.warning(f"일부 섹션을 기본값으로 채워 분석을 마쳤습니다 ({len(invalid)}개)")
+        else:
             logger.info("JSON 파싱 성공")
-            return result_dict
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON 파싱 실패: {e}", exc_info=True)
-            logger.error(f"문제가 있는 JSON 문자열: {result_str}")
-            
-            # 기본 구조 반환
-            return {
-                "Patient": {
-                    "name": {"text": "알 수 없음"},
-                    "birth_date": None,
-                    "gender": None
-                },
-                "Encounter": {
-                    "status": "finished",
-                    "class": "AMB",
-                    "type": "진료",
-                    "period": {"start": current_time},
-                    "reason_text": "상담"
-                },
-                "Condition": {
-                    "clinical_status": "active",
-                    "verification_status": "provisional",
-                    "code": {"text": "상담 필요"},
-                    "onset_datetime": current_time,
-                    "severity": "moderate"
-                },
-                "Observation": [{
-                    "status": "final",
-                    "code": {"text": "초기 상담"},
-                    "value_string": "자세한 내용 파악 필요",
-                    "effective_datetime": current_time
-                }],
-                "MedicationStatement": []
-            }
+        return result_dict
             
+    except (AdmissionRejected, LLMNotConfigured):
+        raise
     except Exception as e:
         logger.error(f"LLM 분석 중 오류 발생: {e}", exc_info=True)
+        # LLM 호출 실패는 재시도할 수 있도록 구분하여 전달
+        error_type = LLMRequestFailed if isinstance(e, LLMRequestFailed) else ValueError
+        raise error_type(f"대화 분석 중 오류가 발생했습니다: {str(e)}")
+
+
+def analyze_incremental(current_state: Dict[str, Any], new_text: str) -> Dict[str, Any]:
+    """
+    지금까지의 분석 결과와 새로 추가된 대화만 LLM에 보내 변경된 부분을 반환합니다.
+
+    전체 대화를 다시 보내지 않으므로 대화가 길어져도 호출 비용이 거의 일정합니다.
+    응답을 파싱할 수 없으면 ValueError를 발생시킵니다 (호출하는 쪽은 분석 위치를 옮기지 않고 다음 발화와 함께 다시 분석).
+    """
+    user_content = (
+        "현재 결과:\n"
+        + json.dumps(current_state, ensure_ascii=False, separators=(",", ":"))
+        + "\n\n새 대화:\n"
+        + _preprocess(new_text)
+    )
+    try:
+        result_str = _complete(INCREMENTAL_SYSTEM_PROMPT, INCREMENTAL_SYSTEM_PROMPT_TOKENS, user_content)
+    except (AdmissionRejected, LLMNotConfigured):
+        raise
+    except Exception as e:
+        logger.error(f"증분 분석 중 오류 발생: {e}", exc_info=True)
         raise ValueError(f"대화 분석 중 오류가 발생했습니다: {str(e)}")
+
+    result_str = clean_json_string(result_str)
+    try:
+        delta = json.loads(result_str)
+    except json.JSONDecodeError as e:
+        logger.error(f"증분 분석 JSON 파싱 실패: {e}")
+        LLM_FALLBACKS.inc()
+        raise ValueError("증분 분석 결과를 해석할 수 없습니다.")
+    if not isinstance(delta, dict):
+        LLM_FALLBACKS.inc()
+        raise ValueError("증분 분석 결과가 JSON 객체가 아닙니다.")
+
+    # 새로 관찰된 항목의 시점은 현재 시간으로 설정
+    current_time = datetime.utcnow().isoformat()
+    if isinstance(delta.get("Observation"), list):
+        for obs in delta["Observation"]:
+            if isinstance(obs, dict):
+                obs["effective_datetime"] = current_time
+    return delta
@@ -0,0 +1,167 @@
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# LLM 호출은 수 초~수십 초 단위이므로 HTTP와 별도의 버킷 사용
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LLM_BUCKETS = (0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+DB_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+# HTTP
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ["method", "route", "status"], buckets=HTTP_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "처리 중인 HTTP 요청 수", ["method"], multiprocess_mode="livesum"
+)
+
+# 데이터베이스
+DB_STATEMENTS = Counter("db_statements_total", "실행된 SQL 문 수", ["role"])
+DB_STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds", "SQL 문 실행 시간", ["role"], buckets=HTTP_BUCKETS
+)
+HTTP_REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements", "요청당 SQL 문 수", ["route"], buckets=DB_COUNT_BUCKETS
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "요청당 SQL 실행 시간 합계", ["route"], buckets=HTTP_BUCKETS
+)
+
+# LLM
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds", "LLM 호출 시간", ["outcome"], buckets=LLM_BUCKETS
+)
+LLM_TOKENS = Counter("llm_tokens_total", "LLM 사용 토큰 수 (completion.usage 기준)", ["type"])
+LLM_JSON_REPAIRS = Counter("llm_json_repairs_total", "clean_json_string이 LLM 출력을 수정한 횟수")
+LLM_FALLBACKS = Counter("llm_fallbacks_total", "증분 분석 응답을 파싱하지 못해 다음 발화와 함께 다시 분석한 횟수")
+LLM_SECTION_INVALID = Counter(
+    "llm_section_invalid_total", "LLM 응답에서 누락되었거나 검증에 실패한 리소스 수", ["section"]
+)
+LLM_SECTION_RETRIES = Counter("llm_section_retries_total", "누락/오류 리소스만 다시 요청한 횟수")
+LLM_SECTION_FALLBACKS = Counter(
+    "llm_section_fallbacks_total", "재요청 후에도 얻지 못해 기본값으로 채운 리소스 수", ["section"]
+)
+TRANSCRIPT_TOKENS = Counter(
+    "transcript_tokens_total", "대화 전처리 전후의 예상 토큰 수", ["stage"]
+)
+
+# LLM admission control
+LLM_ADMISSION_QUEUE_DEPTH = Gauge(
+    "llm_admission_queue_depth", "LLM 한도 대기열 길이", multiprocess_mode="livesum"
+)
+LLM_ADMISSION_WAIT_SECONDS = Histogram(
+    "llm_admission_wait_seconds", "LLM 한도 대기 시간", buckets=(0, 0.1, 0.5, 1, 2, 5, 10, 30)
+)
+LLM_ADMISSION_REJECTED = Counter("llm_admission_rejected_total", "LLM 한도 초과로 거절된 요청 수")
+
+
+@dataclass
+class RequestDBStats:
+    """요청 하나에서 실행된 SQL 문 통계입니다."""
+    statements: int = 0
+    seconds: float = 0.0
+
+
+# 현재 처리 중인 요청의 SQL 통계 (동기 엔드포인트는 컨텍스트가 복사된 스레드풀에서 실행되므로 같은 객체를 공유)
+_request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def instrument_engine(engine: Engine, role: str = "write") -> None:
+    """SQLAlchemy 엔진 이벤트로 SQL 문 수와 실행 시간을 수집합니다 (role: write | read)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_STATEMENTS.labels(role).inc()
+        DB_STATEMENT_SECONDS.labels(role).observe(elapsed)
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+
+
+def _route_template(scope) -> str:
+    """
+    요청 경로 대신 라우트 템플릿(/emr/records/{patient_id})을 라벨로 사용해 카디널리티를 제한합니다.
+    라우팅이 끝난 뒤 scope에 기록된 route를 사용합니다.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    path = scope["path"]
+    try:
+        concrete = route.path_format.format(**scope.get("path_params", {}))
+    except (AttributeError, KeyError):
+        return getattr(route, "path", "unmatched")
+    # include_router의 prefix가 route.path에 포함되지 않는 경우를 위해 실제 경로에서 prefix를 복원
+    if path.endswith(concrete):
+        return path[: len(path) - len(concrete)] + route.path
+    return route.path
+
+
+class MetricsMiddleware:
+    """라우트별 처리 시간, 처리 중인 요청 수, 요청당 SQL 통계를 수집하는 ASGI 미들웨어입니다."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestDBStats()
+        token = _request_db_stats.set(stats)
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            _request_db_stats.reset(token)
+            route = _route_template(scope)
+            HTTP_REQUEST_SECONDS.labels(method, route, str(status_code)).observe(elapsed)
+            HTTP_REQUEST_DB_STATEMENTS.labels(route).observe(stats.statements)
+            HTTP_REQUEST_DB_SECONDS.labels(route).observe(stats.seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Prometheus 텍스트 형식의 지표를 반환합니다.
+
+    PROMETHEUS_MULTIPROC_DIR이 설정된 경우(uvicorn --workers N) 모든 워커 프로세스의 지표를 합산합니다.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,224 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import ReadSessionLocal
+from app.models.change_log import PatientChange
+from app.models.emr import Patient
+
+logger = logging.getLogger(__name__)
+
+# 한글 음절의 초성 (유니코드 호환 자모)
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+
+# 동기화 시 이미 반영한 마지막 id보다 이만큼 아래부터 다시 확인
+# (PostgreSQL 등에서 동시에 저장하면 작은 id가 큰 id보다 늦게 커밋될 수 있으므로, 이미 반영한 id는 건너뛰고 늦게 보인 변경만 반영)
+SYNC_OVERLAP_IDS = 1000
+
+# 검색 결과에 포함하는 환자 필드 (PatientListResponse)
+_SUMMARY_COLUMNS = (Patient.id, Patient.identifier, Patient.name, Patient.gender, Patient.birth_date, Patient.created_at)
+
+
+def normalize(text: str) -> str:
+    """검색 키와 검색어를 같은 형태로 정규화합니다 (공백 제거, 소문자)."""
+    return "".join(text.split()).lower()
+
+
+def to_chosung(text: str) -> str:
+    """한글 음절을 초성으로 바꿉니다 ("김민수" → "ㄱㅁㅅ"). 한글이 아닌 문자는 그대로 둡니다."""
+    return "".join(
+        CHOSUNG[(ord(ch) - _HANGUL_FIRST) // 588] if _HANGUL_FIRST <= ord(ch) <= _HANGUL_LAST else ch
+        for ch in text
+    )
+
+
+def index_keys(identifier: Optional[str], name: Optional[str]) -> set[str]:
+    """환자 하나의 검색 키 (차트번호, 이름, 이름 초성)."""
+    keys = set()
+    if identifier:
+        keys.add(normalize(identifier))
+    if name:
+        keys.add(normalize(name))
+        keys.add(to_chosung(normalize(name)))
+    keys.discard("")
+    return keys
+
+
+class PatientSearchIndex:
+    """
+    차트번호와 이름(name.text)에 대한 메모리 접두사 인덱스입니다.
+
+    - 정렬된 (키, 환자 ID) 목록을 이분 탐색하므로 검색은 O(log n + k)
+    - 전체 키(prefix)를 먼저, 키의 중간부터 일치하는 접미사 키(suffix, "민수" → "김민수", "1234" → "P001234")를 다음 순위로 반환
+    - 이름은 초성 키도 함께 저장하여 "ㄱㅁㅅ"로 "김민수"를 찾을 수 있음
+    - 워커 간 일관성: 저장/삭제 시 patient_changes에 기록하고, 각 워커는 검색 시
+      PATIENT_SEARCH_SYNC_SECONDS마다 마지막으로 반영한 id - SYNC_OVERLAP_IDS 이후의 변경 중 반영하지 않은 것만 읽어 반영
+    """
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._lock = threading.RLock()
+        self._prefix: List[Tuple[str, int]] = []
+        self._suffix: List[Tuple[str, int]] = []
+        self._keys: Dict[int, set[str]] = {}
+        self._patients: Dict[int, Dict[str, Any]] = {}
+        self._last_change_id = 0
+        # 다시 확인하는 구간(SYNC_OVERLAP_IDS)에서 이미 반영한 변경 id
+        self._applied_ids: set[int] = set()
+        self._last_sync = 0.0
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._patients)
+
+    # 인덱스 갱신
+    def _add(self, patient: Dict[str, Any]) -> None:
+        self._remove(patient["id"])
+        name = patient["name"].get("text") if isinstance(patient["name"], dict) else None
+        keys = index_keys(patient["identifier"], name)
+        for key in keys:
+            insort(self._prefix, (key, patient["id"]))
+            for start in range(1, len(key)):
+                insort(self._suffix, (key[start:], patient["id"]))
+        self._keys[patient["id"]] = keys
+        self._patients[patient["id"]] = patient
+
+    def _remove(self, patient_id: int) -> None:
+        for key in self._keys.pop(patient_id, ()):
+            self._discard(self._prefix, (key, patient_id))
+            for start in range(1, len(key)):
+                self._discard(self._suffix, (key[start:], patient_id))
+        self._patients.pop(patient_id, None)
+
+    @staticmethod
+    def _discard(entries: List[Tuple[str, int]], entry: Tuple[str, int]) -> None:
+        i = bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+
+    def load(self, patients: Iterable[Dict[str, Any]], last_change_id: int, applied_ids: Iterable[int] = ()) -> None:
+        """환자 목록으로 인덱스를 새로 만듭니다."""
+        prefix, suffix, keys_by_id, by_id = [], [], {}, {}
+        for patient in patients:
+            name = patient["name"].get("text") if isinstance(patient["name"], dict) else None
+            keys = index_keys(patient["identifier"], name)
+            for key in keys:
+                prefix.append((key, patient["id"]))
+                suffix.extend((key[start:], patient["id"]) for start in range(1, len(key)))
+            keys_by_id[patient["id"]] = keys
+            by_id[patient["id"]] = patient
+        prefix.sort()
+        suffix.sort()
+        with self._lock:
+            self._prefix, self._suffix, self._keys, self._patients = prefix, suffix, keys_by_id, by_id
+            self._last_change_id = last_change_id
+            self._applied_ids = set(applied_ids)
+            self._last_sync = time.monotonic()
+            self._built = True
+
+    def build(self, db: Optional[Session] = None) -> None:
+        """DB의 모든 환자로 인덱스를 만듭니다 (서버 시작 시)."""
+        own_session = db is None
+        db = db or ReadSessionLocal()
+        try:
+            started = time.perf_counter()
+            # 환자 목록보다 먼저 읽어, 읽는 도중의 변경은 다음 동기화에서 (중복 반영되더라도) 빠짐없이 반영
+            last_change_id = db.scalar(select(func.max(PatientChange.id))) or 0
+            applied_ids = db.scalars(
+                select(PatientChange.id).where(PatientChange.id > last_change_id - SYNC_OVERLAP_IDS)
+            ).all()
+            rows = db.execute(select(*_SUMMARY_COLUMNS)).mappings().all()
+            self.load((dict(row) for row in rows), last_change_id, applied_ids)
+            logger.info(f"환자 검색 인덱스 생성: {len(rows)}명 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        finally:
+            if own_session:
+                db.close()
+
+    def sync(self, db: Session, force: bool = False) -> None:
+        """다른 워커에서 기록한 변경을 반영합니다. force가 아니면 sync_interval마다 한 번만 DB를 확인합니다."""
+        if not self._built:
+            self.build(db)
+            return
+        if not force and time.monotonic() - self._last_sync < self.sync_interval:
+            return
+
+        with self._lock:
+            floor = max(0, self._last_change_id - SYNC_OVERLAP_IDS)
+            changes = [
+                change for change in db.execute(
+                    select(PatientChange.id, PatientChange.patient_id, PatientChange.op)
+                    .where(PatientChange.id > floor)
+                    .order_by(PatientChange.id)
+                ).all()
+                if change[0] not in self._applied_ids
+            ]
+            self._last_sync = time.monotonic()
+            if not changes:
+                return
+            oldest = db.scalar(select(func.min(PatientChange.id)))
+            if self._last_change_id and oldest is not None and oldest > self._last_change_id + 1:
+                # 반영하지 못한 변경 기록이 이미 정리된 경우 전체 다시 생성
+                self.build(db)
+                return
+
+            # 변경 순서가 뒤바뀌어 보일 수 있으므로 op와 관계없이 현재 DB 상태를 다시 읽어 반영 (없으면 삭제)
+            changed = {patient_id for _, patient_id, _ in changes}
+            rows = db.execute(select(*_SUMMARY_COLUMNS).where(Patient.id.in_(changed))).mappings().all()
+            found = set()
+            for row in rows:
+                self._add(dict(row))
+                found.add(row["id"])
+            for patient_id in changed - found:
+                self._remove(patient_id)
+
+            self._last_change_id = max(self._last_change_id, changes[-1][0])
+            floor = self._last_change_id - SYNC_OVERLAP_IDS
+            self._applied_ids = {change_id for change_id in self._applied_ids if change_id > floor}
+            self._applied_ids.update(change[0] for change in changes if change[0] > floor)
+
+    def mark_stale(self) -> None:
+        """이 워커에서 환자를 저장/삭제한 뒤 호출하여 다음 검색에서 바로 동기화하도록 합니다."""
+        self._last_sync = 0.0
+
+    # 검색
+    def _scan(self, entries: List[Tuple[str, int]], query: str, seen: set, results: List[Dict[str, Any]], limit: int) -> None:
+        i = bisect_left(entries, (query, -1))
+        while i < len(entries) and len(results) < limit:
+            key, patient_id = entries[i]
+            if not key.startswith(query):
+                break
+            if patient_id not in seen:
+                seen.add(patient_id)
+                results.append(self._patients[patient_id])
+            i += 1
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """차트번호/이름/초성이 query로 시작하는 환자를 먼저, 중간에 포함하는 환자를 다음으로 최대 limit명 반환합니다."""
+        query = normalize(query)
+        if not query:
+            return []
+        results: List[Dict[str, Any]] = []
+        seen: set = set()
+        with self._lock:
+            self._scan(self._prefix, query, seen, results, limit)
+            self._scan(self._suffix, query, seen, results, limit)
+        return results
+
+
+@lru_cache
+def get_patient_search_index() -> PatientSearchIndex:
+    """프로세스의 환자 검색 인덱스를 반환합니다 (처음 호출될 때 설정을 읽어 생성)."""
+    return PatientSearchIndex(sync_interval=settings.PATIENT_SEARCH_SYNC_SECONDS)
+
+
+def record_patient_change(db: Session, patient_id: int, op: str) -> None:
+    """환자 저장/삭제를 변경 기록에 추가합니다 (저장/삭제와 같은 트랜잭션)."""
+    db.add(PatientChange(patient_id=patient_id, op=op))
@@ -0,0 +1,142 @@
+import logging
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, Iterable, Tuple
+
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.analytics import CodeTotalRollup, DailyCodeRollup, DailyEncounterRollup
+from app.models.emr import Condition, Encounter, MedicationStatement, Observation
+
+logger = logging.getLogger(__name__)
+
+
+def _field(item: Any, name: str) -> Any:
+    """ORM 객체와 map_sub_resources 결과(dict) 모두에서 필드 값을 읽습니다."""
+    return item.get(name) if isinstance(item, dict) else getattr(item, name)
+
+
+def _text(value: Any) -> str | None:
+    return value.get("text") if isinstance(value, dict) else None
+
+
+def encounter_code_counts(
+    conditions: Iterable[Any],
+    observations: Iterable[Any],
+    medications: Iterable[Any],
+) -> Counter:
+    """진료 하나의 하위 리소스에서 (kind, code)별 집계 수를 계산합니다."""
+    counts: Counter = Counter()
+    for condition in conditions:
+        if diagnosis := _text(_field(condition, "code")):
+            counts[("diagnosis", diagnosis)] += 1
+        if severity := _field(condition, "severity"):
+            counts[("severity", severity)] += 1
+    for observation in observations:
+        if code := _text(_field(observation, "code")):
+            counts[("observation", code)] += 1
+    for medication in medications:
+        if name := _text(_field(medication, "medication")):
+            counts[("medication", name)] += 1
+    return counts
+
+
+def _upsert_increment(db: Session, model, keys: Dict[str, Any], column: str, amount: int) -> None:
+    """집계 행의 값을 amount만큼 더합니다 (행이 없으면 생성). 같은 트랜잭션에서 원본 기록과 함께 커밋됩니다."""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        table = model.__table__
+        stmt = dialect_insert(table).values(**keys, **{column: amount})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + stmt.excluded[column]},
+        )
+        db.execute(stmt)
+        return
+
+    # 그 외 DB: 행 잠금 후 갱신
+    row = db.get(model, tuple(keys.values()) if len(keys) > 1 else next(iter(keys.values())), with_for_update=True)
+    if row is None:
+        db.add(model(**keys, **{column: amount}))
+        db.flush()
+    else:
+        setattr(row, column, getattr(row, column) + amount)
+
+
+def apply_encounter(db: Session, day: date, counts: Counter, sign: int = 1) -> None:
+    """
+    진료 하나를 집계 테이블에 반영합니다 (sign=1: 저장, sign=-1: 삭제).
+
+    save_emr와 삭제 API의 트랜잭션 안에서 호출하여 원본 기록과 집계가 항상 함께 커밋되도록 합니다.
+    """
+    _upsert_increment(db, DailyEncounterRollup, {"day": day}, "encounters", sign)
+    for (kind, code), count in counts.items():
+        _upsert_increment(db, DailyCodeRollup, {"kind": kind, "code": code, "day": day}, "count", sign * count)
+        _upsert_increment(db, CodeTotalRollup, {"kind": kind, "code": code}, "count", sign * count)
+
+
+def remove_encounter(db: Session, encounter: Encounter) -> None:
+    """삭제할 진료(하위 리소스 포함)를 집계에서 뺍니다."""
+    counts = encounter_code_counts(encounter.conditions, encounter.observations, encounter.medications)
+    apply_encounter(db, encounter.created_at.date(), counts, sign=-1)
+
+
+def rebuild_rollups(db: Session) -> Tuple[int, int, int]:
+    """
+    원본 기록에서 집계 테이블을 전체 다시 계산합니다 (집계 방식 변경, 데이터 복구 시 사용).
+
+    모든 집계를 SQL(INSERT ... SELECT)로 처리하며, 반환값은 (일별 진료, 일별 항목, 전체 항목) 행 수입니다.
+    """
+    db.execute(delete(DailyEncounterRollup))
+    db.execute(delete(DailyCodeRollup))
+    db.execute(delete(CodeTotalRollup))
+
+    day = func.date(Encounter.created_at)
+    db.execute(
+        insert(DailyEncounterRollup).from_select(
+            ["day", "encounters"],
+            select(day, func.count(Encounter.id)).group_by(day),
+        )
+    )
+
+    # encounter_code_counts와 같은 기준으로 NULL과 빈 문자열은 제외
+    def per_day(kind: str, model, code_column):
+        return (
+            select(day.label("day"), literal(kind).label("kind"), code_column.label("code"), func.count().label("count"))
+            .select_from(model)
+            .join(Encounter, Encounter.id == model.encounter_id)
+            .where(code_column.is_not(None), code_column != "")
+            .group_by(day, code_column)
+        )
+
+    db.execute(
+        insert(DailyCodeRollup).from_select(
+            ["day", "kind", "code", "count"],
+            union_all(
+                per_day("diagnosis", Condition, Condition.code_text),
+                per_day("severity", Condition, Condition.severity),
+                per_day("observation", Observation, Observation.code_text),
+                per_day("medication", MedicationStatement, MedicationStatement.medication_text),
+            ),
+        )
+    )
+    db.execute(
+        insert(CodeTotalRollup).from_select(
+            ["kind", "code", "count"],
+            select(DailyCodeRollup.kind, DailyCodeRollup.code, func.sum(DailyCodeRollup.count))
+            .group_by(DailyCodeRollup.kind, DailyCodeRollup.code),
+        )
+    )
+    db.commit()
+
+    counts = tuple(
+        db.scalar(select(func.count()).select_from(model))
+        for model in (DailyEncounterRollup, DailyCodeRollup, CodeTotalRollup)
+    )
+    logger.info(f"집계 테이블을 다시 계산했습니다: 일별 진료 {counts[0]}행, 일별 항목 {counts[1]}행, 전체 항목 {counts[2]}행")
+    return counts
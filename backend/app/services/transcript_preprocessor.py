@@ -0,0 +1,152 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from app.services.llm_admission import estimate_tokens
+
+# 적용 순서대로 나열한 전처리 단계
+AVAILABLE_STEPS = ("timestamps", "speakers", "fillers", "backchannels", "repeats")
+
+# [00:12], (00:01:23), 00:12:34.567, [2024-03-15 09:00:01] 형태의 타임스탬프
+# 발화 중의 시각("오후 3:30에 약을 먹어요")은 지우지 않도록 괄호 안에 있거나 줄 맨 앞에 있는 경우만 제거
+_TIMESTAMP = r"(?:\d{4}-\d{2}-\d{2}[ T])?\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?"
+_BRACKETED_TIMESTAMP_RE = re.compile(r"[\[(]\s*" + _TIMESTAMP + r"\s*[\])]")
+_LEADING_TIMESTAMP_RE = re.compile(r"^\s*" + _TIMESTAMP + r"\s+")
+
+# 줄 앞의 화자 표기 (의사:, [환자], Doctor -, 화자1: 등)
+_SPEAKER_RE = re.compile(
+    r"^\s*[\[(]?\s*(의사|선생님|전문의|doctor|dr\.?|d|환자|patient|pt|p|보호자|화자\s*\d+|speaker\s*\d+)"
+    r"\s*[\])]?\s*[:：\-]\s*",
+    re.IGNORECASE,
+)
+_SPEAKER_ALIASES = {
+    "의사": "의사", "선생님": "의사", "전문의": "의사", "doctor": "의사", "dr": "의사", "dr.": "의사", "d": "의사",
+    "환자": "환자", "patient": "환자", "pt": "환자", "p": "환자",
+    "보호자": "보호자",
+}
+
+# 의미 없이 끼어드는 간투사 (단독 어절일 때만 제거)
+FILLERS = frozenset({
+    "음", "음음", "으음", "흠", "엄", "어", "어어", "으", "에", "아", "아아",
+    "그러니까", "그니까", "뭐랄까", "있잖아요", "있잖아",
+})
+
+# 상대 발화에 대한 맞장구 (발화 전체가 이것뿐일 때만 제거)
+BACKCHANNELS = frozenset({
+    "네", "예", "응", "음", "아", "네네", "예예", "그렇군요", "그렇죠", "그렇구나", "맞아요", "아하", "아네", "알겠습니다",
+})
+
+_TRAILING_PUNCT = ",.…~!"
+_QUESTION_END_RE = re.compile(r"(\?|까요?|나요?|세요|죠)\s*$")
+
+
+@dataclass
+class PreprocessResult:
+    """전처리된 대화와 전후 토큰 수입니다."""
+    text: str
+    tokens_before: int
+    tokens_after: int
+    steps: Tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def reduction_ratio(self) -> float:
+        if not self.tokens_before:
+            return 0.0
+        return 1 - self.tokens_after / self.tokens_before
+
+
+def _bare(token: str) -> str:
+    return token.strip(_TRAILING_PUNCT)
+
+
+def _split_turns(lines: List[str], normalize_speakers: bool) -> List[Tuple[Optional[str], str]]:
+    turns: List[Tuple[Optional[str], str]] = []
+    for line in lines:
+        speaker = None
+        if normalize_speakers:
+            match = _SPEAKER_RE.match(line)
+            if match:
+                label = re.sub(r"\s+", "", match.group(1)).lower()
+                speaker = _SPEAKER_ALIASES.get(label, match.group(1).replace(" ", ""))
+                line = line[match.end():]
+        turns.append((speaker, line.strip()))
+    return turns
+
+
+def _drop_fillers(text: str) -> str:
+    return " ".join(token for token in text.split() if _bare(token) not in FILLERS)
+
+
+def _collapse_repeats(text: str) -> str:
+    """연속으로 반복된 같은 어절("그 그 그", "너무 너무")을 하나로 줄입니다."""
+    tokens: List[str] = []
+    for token in text.split():
+        if tokens and _bare(tokens[-1]) == _bare(token):
+            tokens[-1] = token
+            continue
+        tokens.append(token)
+    return " ".join(tokens)
+
+
+def _is_backchannel(text: str) -> bool:
+    tokens = [_bare(t) for t in text.split()]
+    return bool(tokens) and all(t in BACKCHANNELS for t in tokens)
+
+
+def preprocess_transcript(text: str, steps: Optional[Sequence[str]] = None) -> PreprocessResult:
+    """
+    STT 대화록에서 임상적으로 의미 없는 토큰을 줄입니다.
+
+    - timestamps: 타임스탬프 제거
+    - speakers: 화자 표기를 "의사:"/"환자:"로 통일하고, 같은 화자의 연속 발화를 합침
+    - fillers: 단독 간투사("음", "어", "그러니까") 제거
+    - backchannels: 맞장구만 있는 발화("네", "그렇군요") 제거. 단, 직전 발화가 질문이면 답변이므로 유지
+    - repeats: 연속 반복 어절과 연속 중복 발화 제거
+    """
+    steps = tuple(s for s in AVAILABLE_STEPS if s in (AVAILABLE_STEPS if steps is None else steps))
+    tokens_before = estimate_tokens(text)
+    if not steps:
+        return PreprocessResult(text=text, tokens_before=tokens_before, tokens_after=tokens_before, steps=steps)
+
+    lines = text.splitlines()
+    if "timestamps" in steps:
+        lines = [_LEADING_TIMESTAMP_RE.sub("", _BRACKETED_TIMESTAMP_RE.sub(" ", line)) for line in lines]
+
+    turns = _split_turns(lines, normalize_speakers="speakers" in steps)
+
+    cleaned: List[Tuple[Optional[str], str]] = []
+    for speaker, body in turns:
+        if "fillers" in steps:
+            body = _drop_fillers(body)
+        if "repeats" in steps:
+            body = _collapse_repeats(body)
+        body = " ".join(body.split())
+        if not body:
+            continue
+
+        if "backchannels" in steps and _is_backchannel(body):
+            previous = cleaned[-1] if cleaned else None
+            # 화자를 알 수 없으면(화자 표기가 없거나 speakers 단계를 끈 경우) 다른 화자의 답변으로 간주
+            speakers_unknown = previous is not None and (previous[0] is None or speaker is None)
+            answers_question = (
+                previous is not None
+                and (speakers_unknown or previous[0] != speaker)
+                and _QUESTION_END_RE.search(previous[1])
+            )
+            if not answers_question:
+                continue
+
+        if cleaned and "repeats" in steps and cleaned[-1] == (speaker, body):
+            continue
+        if cleaned and "speakers" in steps and speaker is not None and cleaned[-1][0] == speaker:
+            cleaned[-1] = (speaker, f"{cleaned[-1][1]} {body}")
+            continue
+        cleaned.append((speaker, body))
+
+    result = "\n".join(f"{speaker}: {body}" if speaker else body for speaker, body in cleaned)
+    return PreprocessResult(
+        text=result,
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(result),
+        steps=steps,
+    )
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+LLM 출력 형식(full / compact) 비교 벤치마크
+
+기본 실행은 대표 분석 결과를 두 형식으로 직렬화하여 completion 토큰 수를 비교하고,
+compact 결과를 FHIRMapper.expand_compact로 복원했을 때 기존 구조와 같은지 확인합니다.
+--llm 옵션을 주면 샘플 대화를 각 형식으로 실제 분석하여 completion 토큰(completion.usage)과
+응답 시간을 측정합니다.
+
+사용법:
+    python benchmarks/bench_compact_output.py
+    python benchmarks/bench_compact_output.py --llm --repeat 3
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# 상위 디렉토리를 Python 경로에 추가하여 app 모듈을 import할 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.fhir_mapper import FHIRMapper
+from app.services.llm_admission import estimate_tokens
+
+NOW = "2024-03-15T09:00:00"
+
+# 대표적인 분석 결과 (기존 full 형식)
+FULL_OUTPUT = {
+    "Patient": {"name": {"text": "김민수"}, "birth_date": "1985-04-12", "gender": "male"},
+    "Encounter": {
+        "status": "finished",
+        "class": "AMB",
+        "type": "진료",
+        "period": {"start": NOW},
+        "reason_text": "두 달 전부터 지속된 불면과 우울감",
+    },
+    "Condition": {
+        "clinical_status": "active",
+        "verification_status": "provisional",
+        "code": {"text": "주요우울장애"},
+        "onset_datetime": "2024-01-15T00:00:00",
+        "severity": "moderate",
+    },
+    "Observation": [
+        {"status": "final", "code": {"text": "수면 문제"}, "value_string": "새벽 3시 30분경 자주 깸", "effective_datetime": NOW},
+        {"status": "final", "code": {"text": "식욕 저하"}, "value_string": "입맛이 없음", "effective_datetime": NOW},
+        {"status": "final", "code": {"text": "무쾌감증"}, "value_string": "아무것도 하기 싫고 의미가 없다고 느낌", "effective_datetime": NOW},
+        {"status": "final", "code": {"text": "자살 사고"}, "value_string": "가끔 나쁜 생각이 든다고 함", "effective_datetime": NOW},
+    ],
+    "MedicationStatement": [
+        {
+            "status": "active",
+            "medication": {"text": "프로작 20mg"},
+            "dosage": {"text": "아침 1정"},
+            "effective_period": {"start": "2024-02-01"},
+        },
+    ],
+}
+
+# 같은 내용의 compact 형식
+COMPACT_OUTPUT = {
+    "p": {"n": "김민수", "b": "1985-04-12", "g": "male"},
+    "r": "두 달 전부터 지속된 불면과 우울감",
+    "c": {"dx": "주요우울장애", "on": "2024-01-15T00:00:00", "sv": "moderate"},
+    "o": [
+        {"k": "수면 문제", "v": "새벽 3시 30분경 자주 깸"},
+        {"k": "식욕 저하", "v": "입맛이 없음"},
+        {"k": "무쾌감증", "v": "아무것도 하기 싫고 의미가 없다고 느낌"},
+        {"k": "자살 사고", "v": "가끔 나쁜 생각이 든다고 함"},
+    ],
+    "m": [{"n": "프로작 20mg", "d": "아침 1정", "s": "2024-02-01", "st": None}],
+}
+
+
+def offline() -> None:
+    full_pretty = estimate_tokens(json.dumps(FULL_OUTPUT, ensure_ascii=False, indent=2))
+    full_min = estimate_tokens(json.dumps(FULL_OUTPUT, ensure_ascii=False, separators=(",", ":")))
+    compact_min = estimate_tokens(json.dumps(COMPACT_OUTPUT, ensure_ascii=False, separators=(",", ":")))
+
+    print("예상 completion 토큰")
+    print(f"  full (들여쓰기)   {full_pretty:>5}")
+    print(f"  full (공백 없음)  {full_min:>5}")
+    print(f"  compact           {compact_min:>5}  ({1 - compact_min / full_pretty:.0%} 감소, 들여쓰기 full 대비)")
+
+    expanded = FHIRMapper().expand_compact(COMPACT_OUTPUT, NOW)
+    print(f"compact → full 복원 결과 일치: {'예' if expanded == FULL_OUTPUT else '아니오'}")
+
+
+def online(repeat: int) -> None:
+    from prometheus_client import REGISTRY
+
+    from app.config import settings
+    from app.services.llm_service import analyze_with_llm
+    from eval_transcript_preprocess import SAMPLE_TRANSCRIPTS
+
+    def completion_tokens() -> float:
+        return REGISTRY.get_sample_value("llm_tokens_total", {"type": "completion"}) or 0.0
+
+    print()
+    print(f"{'format':<8} {'calls':>5} {'completion':>10} {'p50_s':>6} {'mean_s':>7}")
+    for output_format in ("full", "compact"):
+        settings.LLM_OUTPUT_FORMAT = output_format
+        durations = []
+        before = completion_tokens()
+        for _ in range(repeat):
+            for text in SAMPLE_TRANSCRIPTS.values():
+                started = time.perf_counter()
+                analyze_with_llm(text)
+                durations.append(time.perf_counter() - started)
+        tokens = (completion_tokens() - before) / len(durations)
+        print(
+            f"{output_format:<8} {len(durations):>5} {tokens:>10.0f} "
+            f"{statistics.median(durations):>6.2f} {statistics.mean(durations):>7.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM 출력 형식(full/compact) 비교")
+    parser.add_argument("--llm", action="store_true", help="실제 LLM 호출로 completion 토큰과 응답 시간 측정")
+    parser.add_argument("--repeat", type=int, default=3, help="샘플 대화당 호출 횟수 (--llm)")
+    args = parser.parse_args()
+
+    offline()
+    if args.llm:
+        online(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+환자 검색 인덱스 벤치마크
+
+무작위 한글 이름과 차트번호를 가진 환자로 메모리 인덱스(app.services.patient_search)를 만든 뒤
+검색어 종류별(차트번호 접두사/중간, 이름 접두사/중간, 초성) 검색 지연 시간과 저장/삭제 반영 시간을 측정합니다.
+수만 명 규모에서 검색 p99가 1ms 미만이어야 합니다.
+
+사용법:
+    python benchmarks/bench_patient_search.py
+    python benchmarks/bench_patient_search.py --patients 100000 --queries 5000 --limit 10
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime
+
+# 상위 디렉토리를 Python 경로에 추가하여 app 모듈을 import할 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.patient_search import PatientSearchIndex, to_chosung
+from synthetic import make_name
+
+
+def make_patients(count: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "id": patient_id,
+            "identifier": f"P{patient_id:07d}",
+            "name": {"text": make_name(rng)},
+            "gender": rng.choice(("male", "female")),
+            "birth_date": date(1950, 1, 1),
+            "created_at": datetime(2024, 1, 1),
+        }
+        for patient_id in range(1, count + 1)
+    ]
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="환자 검색 인덱스 검색/갱신 지연 시간 측정")
+    parser.add_argument("--patients", type=int, default=50000, help="인덱스에 넣을 환자 수")
+    parser.add_argument("--queries", type=int, default=2000, help="검색어 종류별 검색 횟수")
+    parser.add_argument("--limit", type=int, default=10, help="검색 결과 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    patients = make_patients(args.patients, rng)
+    index = PatientSearchIndex(sync_interval=0)
+    started = time.perf_counter()
+    index.load(patients, last_change_id=0)
+    print(f"환자 {args.patients}명 인덱스 생성: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    kinds = {
+        "id_prefix": lambda p: p["identifier"][:5],
+        "id_infix": lambda p: p["identifier"][-4:],
+        "name_prefix": lambda p: p["name"]["text"][:2],
+        "name_infix": lambda p: p["name"]["text"][1:],
+        "chosung": lambda p: to_chosung(p["name"]["text"]),
+        "chosung_1": lambda p: to_chosung(p["name"]["text"])[:1],
+    }
+    print(f"{'query':<12} {'p50_us':>8} {'p95_us':>8} {'p99_us':>8} {'hits':>6}")
+    for kind, make_query in kinds.items():
+        queries = [make_query(rng.choice(patients)) for _ in range(args.queries)]
+        latencies, hits = [], 0
+        for query in queries:
+            started = time.perf_counter()
+            hits += len(index.search(query, args.limit))
+            latencies.append(time.perf_counter() - started)
+        print(
+            f"{kind:<12} {percentile(latencies, 0.5) * 1e6:>8.1f} {percentile(latencies, 0.95) * 1e6:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1e6:>8.1f} {hits / len(queries):>6.1f}"
+        )
+
+    # 저장/삭제 반영 (sync에서 변경 한 건당 수행하는 작업)
+    latencies = []
+    for patient in rng.sample(patients, min(len(patients), args.queries)):
+        updated = dict(patient, name={"text": make_name(rng)})
+        started = time.perf_counter()
+        index._add(updated)
+        latencies.append(time.perf_counter() - started)
+    print(f"{'upsert':<12} {percentile(latencies, 0.5) * 1e6:>8.1f} {percentile(latencies, 0.95) * 1e6:>8.1f} {percentile(latencies, 0.99) * 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+읽기/쓰기 풀 분리 벤치마크
+
+임시 SQLite DB에 환자와 진료 기록을 채운 뒤, 조회 스레드만 실행할 때와 저장/삭제 프로세스를 함께 실행할 때의
+조회 지연 시간(get_patients, get_patient_records)을 비교합니다. 쓰기는 별도 프로세스에서 실행하여
+(uvicorn 워커가 여러 개인 경우처럼) GIL 경합이 아닌 DB 잠금과 연결 경합만 측정합니다.
+
+- shared: 하나의 엔진/풀을 읽기와 쓰기가 함께 사용 (rollback journal, 분리 이전 구성)
+- split:  쓰기용 작은 풀(WAL) + mode=ro 조회용 풀 (app.db.session의 기본 구성)
+
+split 구성에서는 쓰기 부하 중에도 조회 지연 시간이 거의 변하지 않아야 합니다.
+단, CPU 코어가 조회 스레드 + 쓰기 프로세스 수보다 적으면 CPU 경합으로 두 구성 모두 지연 시간이 늘어납니다.
+
+사용법:
+    python benchmarks/bench_read_write.py
+    python benchmarks/bench_read_write.py --patients 500 --duration 10 --readers 8 --writers 2
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# 상위 디렉토리를 Python 경로에 추가하여 app 모듈을 import할 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 앱 전역 엔진이 개발용 emr.db를 가리키지 않도록 import 전에 임시 DB로 지정
+_TMP_DIR = tempfile.mkdtemp(prefix="bench_read_write_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR}/app.db"
+
+from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
+
+from app.api.emr import delete_encounter_record, get_patient_records, get_patients, save_emr
+from app.config import settings
+from app.db.base import Base
+from app.db.session import create_read_engine, create_write_engine
+from app.schemas.emr import EMRSaveRequest
+
+ANALYSIS_RESULT = {
+    "Encounter": {"status": "finished", "type": "진료", "reason_text": "불면과 우울감"},
+    "Condition": {"code": {"text": "주요우울장애"}, "severity": "moderate"},
+    "Observation": [
+        {"status": "final", "code": {"text": "수면 문제"}, "value_string": "새벽에 자주 깸"},
+        {"status": "final", "code": {"text": "식욕 저하"}, "value_string": "입맛이 없음"},
+    ],
+    "MedicationStatement": [{"status": "active", "medication": {"text": "프로작 20mg"}, "dosage": {"text": "아침 1정"}}],
+}
+
+
+def save_request(patient_no: int) -> EMRSaveRequest:
+    return EMRSaveRequest(
+        patient_identifier=f"P{patient_no:06d}",
+        patient_name=f"환자{patient_no}",
+        patient_birth_date="1985-04-12",
+        patient_gender="male",
+        conversation_text="의사: 요즘 어떠세요?\n환자: 잠을 잘 못 자요.",
+        llm_analysis_result=ANALYSIS_RESULT,
+    )
+
+
+def build_engines(mode: str, db_path: str, readers: int, writers: int):
+    url = f"sqlite:///{db_path}"
+    if mode == "shared":
+        settings.SQLITE_WAL = False
+        engine = create_write_engine(url, pool_size=readers + writers, max_overflow=0)
+        return engine, engine
+    settings.SQLITE_WAL = True
+    write_engine = create_write_engine(url, pool_size=settings.DB_WRITE_POOL_SIZE, max_overflow=settings.DB_WRITE_MAX_OVERFLOW)
+    read_engine = create_read_engine(url, None, pool_size=readers, max_overflow=0)
+    return write_engine, read_engine
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def writer_process(mode: str, db_path: str, patients: int, duration: float, seed: int, results) -> None:
+    """별도 프로세스에서 duration초 동안 저장/삭제를 반복합니다 (조회 스레드와 GIL을 공유하지 않도록)."""
+    write_engine, _ = build_engines(mode, db_path, readers=0, writers=1)
+    write_session = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+    rng = random.Random(seed)
+    writes = errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        db = write_session()
+        try:
+            response = save_emr(save_request(rng.randint(1, patients)), db=db)
+            if rng.random() < 0.3:
+                delete_encounter_record(encounter_id=response.encounter_id, db=db)
+            writes += 1
+        except Exception:
+            errors += 1
+        finally:
+            db.close()
+    write_engine.dispose()
+    results.put((writes, errors))
+
+
+def run_phase(mode: str, db_path: str, read_session, patients: int, duration: float, readers: int, writers: int):
+    """duration초 동안 조회 스레드(와 쓰기 프로세스)를 실행하고 (조회 지연 목록, 조회 오류 수, 쓰기 수, 쓰기 오류 수)를 반환합니다."""
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies: list[float] = []
+    read_errors = 0
+
+    def reader(seed: int):
+        nonlocal read_errors
+        rng = random.Random(seed)
+        local: list[float] = []
+        errors = 0
+        while not stop.is_set():
+            db = read_session()
+            started = time.perf_counter()
+            try:
+                if rng.random() < 0.2:
+                    get_patients(db=db)
+                else:
+                    get_patient_records(patient_id=rng.randint(1, patients), db=db)
+                local.append(time.perf_counter() - started)
+            except HTTPException:
+                local.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+            finally:
+                db.close()
+        with lock:
+            latencies.extend(local)
+            read_errors += errors
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=writer_process, args=(mode, db_path, patients, duration, 1000 + i, results))
+        for i in range(writers)
+    ]
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for worker in processes + threads:
+        worker.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    writes = write_errors = 0
+    for process in processes:
+        count, errors = results.get()
+        writes += count
+        write_errors += errors
+        process.join()
+    return latencies, read_errors, writes, write_errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="읽기/쓰기 풀 분리 시 쓰기 부하 중 조회 지연 시간 비교")
+    parser.add_argument("--patients", type=int, default=200, help="미리 저장할 환자 수")
+    parser.add_argument("--encounters", type=int, default=3, help="환자당 미리 저장할 진료 기록 수")
+    parser.add_argument("--duration", type=float, default=5.0, help="구간별 실행 시간 (초)")
+    parser.add_argument("--readers", type=int, default=4, help="조회 스레드 수")
+    parser.add_argument("--writers", type=int, default=2, help="저장/삭제 프로세스 수")
+    args = parser.parse_args()
+
+    if (os.cpu_count() or 1) < 1 + args.writers:
+        print(f"⚠️ CPU 코어 {os.cpu_count()}개: 쓰기 구간의 지연 시간에는 CPU 경합이 포함됩니다.")
+    print(
+        f"{'mode':<7} {'phase':<8} {'reads':>7} {'p50_ms':>7} {'p95_ms':>7} {'p99_ms':>7} "
+        f"{'read_err':>8} {'writes/s':>8} {'write_err':>9}"
+    )
+    for mode in ("shared", "split"):
+        db_path = os.path.join(_TMP_DIR, f"{mode}.db")
+        write_engine, read_engine = build_engines(mode, db_path, args.readers, args.writers)
+        Base.metadata.create_all(bind=write_engine)
+        write_session = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+        read_session = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+        for patient_no in range(1, args.patients + 1):
+            for _ in range(args.encounters):
+                db = write_session()
+                try:
+                    save_emr(save_request(patient_no), db=db)
+                finally:
+                    db.close()
+
+        for phase, writers in (("idle", 0), ("writing", args.writers)):
+            latencies, read_errors, writes, write_errors = run_phase(
+                mode, db_path, read_session, args.patients, args.duration, args.readers, writers
+            )
+            print(
+                f"{mode:<7} {phase:<8} {len(latencies):>7} "
+                f"{percentile(latencies, 0.5) * 1000:>7.2f} "
+                f"{percentile(latencies, 0.95) * 1000:>7.2f} {percentile(latencies, 0.99) * 1000:>7.2f} "
+                f"{read_errors:>8} {writes / args.duration:>8.1f} {write_errors:>9}"
+            )
+
+        write_engine.dispose()
+        if read_engine is not write_engine:
+            read_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
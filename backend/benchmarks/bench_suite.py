@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+백엔드 주요 경로 벤치마크 모음
+
+synthetic.py로 만든 결정적 합성 데이터(기본 1k 진료)를 임시 SQLite DB에 채운 뒤 다음을 측정합니다.
+
+- micro: clean_json_string, FHIRMapper.map_encounter_data, FHIRMapper.map_sub_resources
+- macro: save_emr, get_patient_records, get_patients, delete_encounter_record, delete_patient
+  (API 함수를 요청당 세션과 함께 직접 호출, HTTP 계층 제외)
+
+벤치마크별로 처리량(ops/s), 지연 시간 백분위(p50/p95/p99), 요청 하나의 최대 메모리 할당량(tracemalloc),
+요청당 SQL 실행 수를 출력합니다. 각 단계는 같은 DB 복사본과 같은 시드로 시작합니다.
+
+- 메모리/SQL 실행 수: 정해진 --memory-runs회를 시간 제한 없이 실행 (같은 시드에서 SQL 실행 수는 항상 같음)
+- 처리량/지연 시간: --repeats회 반복 측정한 지표별 중앙값 (반복마다 새 DB 복사본 사용)
+
+benchmarks/baseline.json에 같은 규모의 기준값이 있으면 비교하여
+--threshold(macro 벤치마크의 처리량/지연 시간은 --macro-threshold) 이상 느려지거나 메모리가 늘어난 경우,
+SQL 실행 수가 늘어난 경우 회귀로 표시하고 종료 코드 1을 반환합니다.
+요청 하나의 시간 변화가 LATENCY_MS_TOLERANCE(0.05ms) 미만이거나 메모리 변화가 PEAK_KB_TOLERANCE(64KB) 미만이면
+변화율과 관계없이 잡음으로 보고 회귀로 표시하지 않습니다.
+기준값은 실행한 머신에 따라 달라지므로 같은 머신에서 --save-baseline으로 갱신한 뒤 비교하세요.
+
+사용법:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --scale 100k --iterations 500 --repeats 5
+    python benchmarks/bench_suite.py --db /tmp/emr_1m.db --scale 1m   # synthetic.py로 미리 만든 DB (복사본 사용)
+    python benchmarks/bench_suite.py --only save_emr,get_patient_records --output /tmp/result.json
+    python benchmarks/bench_suite.py --save-baseline
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# 상위 디렉토리를 Python 경로에 추가하여 app 모듈을 import할 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 앱 전역 엔진이 개발용 emr.db를 가리키지 않도록 import 전에 임시 DB로 지정
+_TMP_DIR = tempfile.mkdtemp(prefix="bench_suite_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP_DIR}/app.db"
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.emr import delete_encounter_record, delete_patient, get_patient_records, get_patients, save_emr
+from app.config import settings
+from app.db.base import Encounter, Patient
+from app.db.session import create_read_engine, create_write_engine
+from app.schemas.emr import EMRSaveRequest
+from app.services.fhir_mapper import FHIRMapper
+from app.services.llm_service import clean_json_string
+from synthetic import BASE_TIME, SCALES, make_llm_output, make_llm_result, make_name, make_patient, make_transcript, populate_db
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 비교하는 지표와 방향 (1: 클수록 나쁨, -1: 작을수록 나쁨)
+COMPARED_METRICS = {"ops_per_sec": -1, "p50_ms": 1, "p95_ms": 1, "peak_kb": 1}
+
+# 이 크기 미만의 메모리 변화는 회귀로 보지 않음 (할당기 잡음)
+PEAK_KB_TOLERANCE = 64
+# 요청 하나의 시간 변화가 이 값(ms) 미만이면 회귀로 보지 않음 (수 μs 단위인 micro 벤치마크의 측정 잡음)
+LATENCY_MS_TOLERANCE = 0.05
+
+
+class QueryCounter:
+    """엔진에서 실행된 SQL 문 수를 셉니다."""
+
+    def __init__(self, *engines):
+        self.count = 0
+        for engine in set(engines):
+            event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args) -> None:
+        self.count += 1
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Suite:
+    """벤치마크별 준비 함수 모음. 각 준비 함수는 count개의 실행 함수(입력이 준비된 요청 하나)를 반환합니다."""
+
+    def __init__(self, write_session, read_session, seed: int, pool_size: int):
+        self.write_session = write_session
+        self.read_session = read_session
+        self.rng = random.Random(seed)
+        self.mapper = FHIRMapper()
+        self.llm_results = [make_llm_result(self.rng, BASE_TIME) for _ in range(pool_size)]
+        self.llm_outputs = [make_llm_output(self.rng, result, messy=0.5) for result in self.llm_results]
+        with read_session() as db:
+            self.max_patient_id = db.scalar(select(func.max(Patient.id))) or 0
+            encounter_ids = list(db.scalars(select(Encounter.id).order_by(Encounter.id)))
+        # 삭제 벤치마크는 서로 다른 대상을 한 번씩만 사용 (id 순으로 읽어 실행마다 같은 대상을 고름)
+        self.encounter_pool = self.rng.sample(encounter_ids, len(encounter_ids))
+        self.patient_pool = self.rng.sample(range(1, self.max_patient_id + 1), self.max_patient_id)
+        self.new_patients = 0
+
+    def _with_session(self, session_factory, fn: Callable, **kwargs) -> Callable[[], Any]:
+        def run():
+            db = session_factory()
+            try:
+                return fn(db=db, **kwargs)
+            finally:
+                db.close()
+        return run
+
+    # micro
+    def clean_json_string(self, count: int) -> List[Callable[[], Any]]:
+        return [lambda raw=self.rng.choice(self.llm_outputs): clean_json_string(raw) for _ in range(count)]
+
+    def map_encounter_data(self, count: int) -> List[Callable[[], Any]]:
+        return [
+            lambda result=copy.deepcopy(self.rng.choice(self.llm_results)): self.mapper.map_encounter_data(result)
+            for _ in range(count)
+        ]
+
+    def map_sub_resources(self, count: int) -> List[Callable[[], Any]]:
+        return [
+            lambda result=copy.deepcopy(self.rng.choice(self.llm_results)): self.mapper.map_sub_resources(result, 1)
+            for _ in range(count)
+        ]
+
+    # macro
+    def save_emr(self, count: int) -> List[Callable[[], Any]]:
+        runs = []
+        for _ in range(count):
+            # 80%는 기존 환자의 재진, 20%는 신규 환자
+            if self.max_patient_id and self.rng.random() < 0.8:
+                patient_no = self.rng.randint(1, self.max_patient_id)
+            else:
+                self.new_patients += 1
+                patient_no = 9_000_000 + self.new_patients
+            patient = make_patient(self.rng, patient_no)
+            patient["name"] = {"text": make_name(self.rng)}
+            result = make_llm_result(self.rng, BASE_TIME, patient)
+            request = EMRSaveRequest(
+                patient_identifier=patient["identifier"],
+                patient_name=patient["name"]["text"],
+                patient_birth_date=patient["birth_date"].isoformat(),
+                patient_gender=patient["gender"],
+                conversation_text=make_transcript(self.rng, result),
+                llm_analysis_result=result,
+            )
+            runs.append(self._with_session(self.write_session, save_emr, request=request))
+        return runs
+
+    def get_patient_records(self, count: int) -> List[Callable[[], Any]]:
+        return [
+            self._with_session(self.read_session, get_patient_records, patient_id=self.rng.randint(1, self.max_patient_id))
+            for _ in range(count)
+        ]
+
+    def get_patients(self, count: int) -> List[Callable[[], Any]]:
+        return [self._with_session(self.read_session, get_patients) for _ in range(count)]
+
+    def delete_encounter_record(self, count: int) -> List[Callable[[], Any]]:
+        ids = [self.encounter_pool.pop() for _ in range(min(count, len(self.encounter_pool)))]
+        return [self._with_session(self.write_session, delete_encounter_record, encounter_id=i) for i in ids]
+
+    def delete_patient(self, count: int) -> List[Callable[[], Any]]:
+        ids = [self.patient_pool.pop() for _ in range(min(count, len(self.patient_pool)))]
+        return [self._with_session(self.write_session, delete_patient, patient_id=i) for i in ids]
+
+
+# 실행 순서 (조회 벤치마크가 삭제된 데이터를 보지 않도록 삭제를 마지막에 실행)
+BENCHMARKS = (
+    "clean_json_string",
+    "map_encounter_data",
+    "map_sub_resources",
+    "save_emr",
+    "get_patient_records",
+    "get_patients",
+    "delete_encounter_record",
+    "delete_patient",
+)
+MICRO_BENCHMARKS = frozenset(BENCHMARKS[:3])
+
+
+def measure_counts(suite: Suite, name: str, counter: QueryCounter, runs_count: int) -> Optional[Dict[str, float]]:
+    """
+    정해진 runs_count회 실행의 요청당 SQL 실행 수와 요청 하나의 최대 메모리 할당량을 측정합니다.
+
+    실행 횟수가 측정 시간과 무관하므로 같은 시드에서는 SQL 실행 수가 항상 같습니다.
+    대상 데이터가 남아 있지 않으면 None을 반환합니다.
+    """
+    prepare = getattr(suite, name)
+    warm_up_runs = prepare(min(5, runs_count))
+    runs = prepare(runs_count)
+    if not runs:
+        return None
+    for run in warm_up_runs:
+        run()
+
+    # tracemalloc은 실행을 느리게 하므로 지연 시간과 따로 측정
+    peak = 0
+    queries_before = counter.count
+    tracemalloc.start()
+    try:
+        for run in runs:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            run()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_kb": round(peak / 1024, 1),
+        "queries_per_op": round((counter.count - queries_before) / len(runs), 2),
+    }
+
+
+def measure_latency(suite: Suite, name: str, iterations: int, max_seconds: float) -> Optional[Dict[str, float]]:
+    """처리량과 지연 시간 백분위를 측정합니다 (최대 max_seconds, 최소 5회). 대상 데이터가 남아 있지 않으면 None을 반환합니다."""
+    prepare = getattr(suite, name)
+    warm_up_runs = prepare(min(5, iterations))
+    runs = prepare(iterations)
+    if not runs:
+        return None
+    for run in warm_up_runs:
+        run()
+
+    latencies = []
+    started = time.perf_counter()
+    for i, run in enumerate(runs):
+        t0 = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - t0)
+        if i >= 4 and time.perf_counter() - started > max_seconds:
+            break
+    elapsed = time.perf_counter() - started
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    macro_threshold: float,
+) -> List[str]:
+    """
+    기준값 대비 회귀 목록을 반환하고 비교 표를 출력합니다.
+
+    macro 벤치마크의 처리량/지연 시간은 DB와 머신 상태에 따라 실행마다 크게 달라지므로 macro_threshold로 비교합니다.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<24} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric, direction in COMPARED_METRICS.items():
+            if not base.get(metric):
+                continue
+            change = current[metric] / base[metric] - 1
+            limit = macro_threshold if name not in MICRO_BENCHMARKS and metric != "peak_kb" else threshold
+            worse = change * direction > limit
+            if metric == "peak_kb" and current[metric] - base[metric] < PEAK_KB_TOLERANCE:
+                worse = False
+            if metric.endswith("_ms") and current[metric] - base[metric] < LATENCY_MS_TOLERANCE:
+                worse = False
+            if metric == "ops_per_sec" and current[metric] and 1000 / current[metric] - 1000 / base[metric] < LATENCY_MS_TOLERANCE:
+                worse = False
+            flag = "  ⚠️ 회귀" if worse else ""
+            print(f"{name:<24} {metric:<15} {base[metric]:>10} {current[metric]:>10} {change:>+8.0%}{flag}")
+            if worse:
+                regressions.append(f"{name}.{metric}")
+        # SQL 실행 수는 정해진 실행에서 측정하여 결정적이므로 조금이라도 늘면 회귀
+        if current["queries_per_op"] > base.get("queries_per_op", 0) + 0.01:
+            print(f"{name:<24} {'queries_per_op':<15} {base.get('queries_per_op', 0):>10} {current['queries_per_op']:>10}  ⚠️ 회귀")
+            regressions.append(f"{name}.queries_per_op")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="백엔드 주요 경로 micro/macro 벤치마크")
+    parser.add_argument("--scale", choices=SCALES, default="1k", help="합성 DB 규모 (진료 수)")
+    parser.add_argument("--db", help="synthetic.py로 미리 만든 SQLite DB (복사하여 사용, --scale은 기준값 구분에만 사용)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=200, help="벤치마크별 최대 실행 횟수 (지연 시간 측정)")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="벤치마크별 최대 측정 시간")
+    parser.add_argument("--memory-runs", type=int, default=20, help="메모리와 SQL 실행 수 측정 실행 횟수 (시간 제한 없이 모두 실행)")
+    parser.add_argument("--repeats", type=int, default=3, help="지연 시간 측정 반복 횟수 (지표별 중앙값 사용)")
+    parser.add_argument("--only", help="쉼표로 구분한 벤치마크 이름")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="기준값 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 해당 규모의 기준값으로 저장")
+    parser.add_argument("--threshold", type=float, default=0.25, help="회귀로 판단할 변화율")
+    parser.add_argument("--macro-threshold", type=float, default=0.5, help="macro 벤치마크 처리량/지연 시간의 회귀 판단 변화율")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"알 수 없는 벤치마크: {', '.join(sorted(unknown))}")
+
+    base_path = os.path.join(_TMP_DIR, "base.db")
+    started = time.perf_counter()
+    if args.db:
+        shutil.copyfile(args.db, base_path)
+    else:
+        engine = create_write_engine(f"sqlite:///{base_path}", settings.DB_WRITE_POOL_SIZE, settings.DB_WRITE_MAX_OVERFLOW)
+        populate_db(engine, SCALES[args.scale], seed=args.seed)
+        engine.dispose()
+    print(f"DB 준비 ({args.db or args.scale}): {time.perf_counter() - started:.1f}s")
+
+    # 단계마다 같은 DB 복사본과 같은 시드로 시작하여, 앞선 단계의 실행 횟수가 다음 단계의 데이터에 영향을 주지 않음
+    def run_phase(label: str, measure: Callable[[Suite, str, QueryCounter], Optional[Dict[str, float]]]) -> Dict[str, Optional[Dict[str, float]]]:
+        db_path = os.path.join(_TMP_DIR, f"{label}.db")
+        shutil.copyfile(base_path, db_path)
+        url = f"sqlite:///{db_path}"
+        write_engine = create_write_engine(url, settings.DB_WRITE_POOL_SIZE, settings.DB_WRITE_MAX_OVERFLOW)
+        read_engine = create_read_engine(url, None, settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW) or write_engine
+        counter = QueryCounter(write_engine, read_engine)
+        suite = Suite(
+            sessionmaker(autocommit=False, autoflush=False, bind=write_engine),
+            sessionmaker(autocommit=False, autoflush=False, bind=read_engine),
+            seed=args.seed,
+            pool_size=200,
+        )
+        try:
+            return {name: measure(suite, name, counter) for name in BENCHMARKS if name in names}
+        finally:
+            write_engine.dispose()
+            read_engine.dispose()
+            os.remove(db_path)
+
+    counts = run_phase("counts", lambda suite, name, counter: measure_counts(suite, name, counter, args.memory_runs))
+    repeats = [
+        run_phase(f"latency_{i}", lambda suite, name, counter: measure_latency(suite, name, args.iterations, args.max_seconds))
+        for i in range(args.repeats)
+    ]
+    shutil.rmtree(_TMP_DIR, ignore_errors=True)
+
+    print(f"{'benchmark':<24} {'ops':>6} {'ops/s':>10} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'peak_kb':>9} {'queries':>8}")
+    results = {}
+    for name, count in counts.items():
+        latencies = [repeat[name] for repeat in repeats]
+        if count is None or None in latencies:
+            print(f"{name:<24} 대상 데이터 없음 (--scale을 늘리거나 --iterations를 줄이세요)")
+            continue
+        # 반복 실행별 지표의 중앙값 (한 번의 실행에서 생긴 잡음이 결과를 좌우하지 않도록)
+        result = {metric: statistics.median(latency[metric] for latency in latencies) for metric in latencies[0]}
+        results[name] = {**result, **count}
+        print(
+            f"{name:<24} {result['ops']:>6} {result['ops_per_sec']:>10} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+            f"{result['p99_ms']:>9} {count['peak_kb']:>9} {count['queries_per_op']:>8}"
+        )
+
+    report = {
+        "meta": {
+            "scale": args.scale,
+            "db": args.db,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "benchmarks": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    if args.save_baseline:
+        saved = baselines.get(args.scale, {"benchmarks": {}})
+        saved["meta"] = report["meta"]
+        saved["benchmarks"].update(results)
+        baselines[args.scale] = saved
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\n{args.baseline}에 {args.scale} 기준값을 저장했습니다.")
+        return
+
+    if args.scale not in baselines:
+        print(f"\n{args.baseline}에 {args.scale} 기준값이 없습니다 (--save-baseline으로 저장).")
+        return
+    regressions = compare(results, baselines[args.scale]["benchmarks"], args.threshold, args.macro_threshold)
+    if regressions:
+        print(f"\n회귀 {len(regressions)}건: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\n회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
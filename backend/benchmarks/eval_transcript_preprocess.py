@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+대화 전처리(transcript_preprocessor) 오프라인 평가 스크립트
+
+전처리 전후의 예상 토큰 수를 비교하고, --llm 옵션을 주면 같은 대화를 전처리 없이/전처리 후
+각각 analyze_with_llm으로 분석하여 추출 결과의 일치도와 응답 시간을 비교합니다.
+
+사용법:
+    python benchmarks/eval_transcript_preprocess.py                    # 내장 샘플, 토큰 수만 비교
+    python benchmarks/eval_transcript_preprocess.py transcripts/ --llm # 디렉토리의 *.txt, LLM 호출 포함
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 상위 디렉토리를 Python 경로에 추가하여 app 모듈을 import할 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.transcript_preprocessor import AVAILABLE_STEPS, preprocess_transcript
+
+SAMPLE_TRANSCRIPTS = {
+    "sample_depression": """[00:00:01] 의사: 음, 안녕하세요. 요즘 어떻게 지내세요?
+[00:00:04] 환자: 어... 그러니까 요즘 좀 힘들어요. 음 잠을 잘 못 자요.
+[00:00:09] 의사: 네
+[00:00:10] 의사: 네 그렇군요. 언제부터 그러셨어요?
+[00:00:13] 환자: 그 그 그 한 두 달 전부터요. 새벽 3:30쯤 자꾸 깨요.
+[00:00:18] 의사: 음
+[00:00:19] 환자: 그리고 어 입맛도 너무 너무 없고요.
+[00:00:22] 의사: 그렇군요
+[00:00:23] 의사: 기분은 어떠세요?
+[00:00:25] 환자: 음... 그냥 아무것도 하기 싫고, 그러니까 뭐랄까 다 의미가 없는 것 같아요.
+[00:00:31] 의사: 혹시 나쁜 생각이 드신 적 있으세요?
+[00:00:34] 환자: 네
+[00:00:35] 환자: 가끔요.
+[00:00:36] 의사: 드시는 약은 있으세요?
+[00:00:38] 환자: 아 네, 프로작 20mg 아침에 한 알 먹고 있어요.
+[00:00:38] 환자: 아 네, 프로작 20mg 아침에 한 알 먹고 있어요.
+[00:00:43] 의사: 네 알겠습니다.""",
+    "sample_anxiety": """Doctor: 오늘은 어떤 일로 오셨어요?
+Patient: 음 어 그게 요즘 가슴이 자꾸 두근거리고 숨이 막혀요.
+Doctor: 네
+Patient: 특히 어 지하철 타면 그래요.
+Doctor: 아 그렇군요. 그럴 때 어떻게 하세요?
+Patient: 그러니까 그냥 내려요. 내려서 한참 앉아 있어요.
+Doctor: 네네
+Patient: 회사에 가는 게 무서워요.
+Doctor: 예전에 약 드신 적 있으세요?
+Patient: 아니요. 없어요.
+Doctor: 자낙스 0.25mg 필요할 때 드시도록 처방해 드릴게요.
+Patient: 네 알겠습니다.""",
+}
+
+
+def load_transcripts(path: str | None) -> dict[str, str]:
+    if not path:
+        return SAMPLE_TRANSCRIPTS
+    root = Path(path)
+    files = sorted(root.glob("*.txt")) if root.is_dir() else [root]
+    return {f.stem: f.read_text(encoding="utf-8") for f in files}
+
+
+def _texts(items, key: str) -> set[str]:
+    if not isinstance(items, list):
+        return set()
+    return {
+        (item.get(key) or {}).get("text", "").strip()
+        for item in items
+        if isinstance(item, dict) and isinstance(item.get(key), dict)
+    } - {""}
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def compare_results(raw: dict, compressed: dict) -> dict:
+    """두 분석 결과에서 진단명, 중증도, 관찰 항목, 약물의 일치도를 계산합니다."""
+    raw_condition = raw.get("Condition") or {}
+    compressed_condition = compressed.get("Condition") or {}
+    return {
+        "diagnosis_match": (raw_condition.get("code") or {}).get("text")
+        == (compressed_condition.get("code") or {}).get("text"),
+        "severity_match": raw_condition.get("severity") == compressed_condition.get("severity"),
+        "observation_jaccard": _jaccard(
+            _texts(raw.get("Observation"), "code"), _texts(compressed.get("Observation"), "code")
+        ),
+        "medication_jaccard": _jaccard(
+            _texts(raw.get("MedicationStatement"), "medication"),
+            _texts(compressed.get("MedicationStatement"), "medication"),
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대화 전처리 전후 토큰 수 및 추출 결과 비교")
+    parser.add_argument("path", nargs="?", help="대화록 .txt 파일 또는 디렉토리 (없으면 내장 샘플 사용)")
+    parser.add_argument("--steps", default=",".join(AVAILABLE_STEPS), help="적용할 전처리 단계 (쉼표로 구분)")
+    parser.add_argument("--llm", action="store_true", help="LLM을 호출하여 추출 결과와 응답 시간도 비교")
+    args = parser.parse_args()
+
+    steps = [s.strip() for s in args.steps.split(",") if s.strip()]
+    transcripts = load_transcripts(args.path)
+
+    print(f"{'transcript':<24} {'before':>7} {'after':>7} {'saved':>6}")
+    reductions = []
+    for name, text in transcripts.items():
+        result = preprocess_transcript(text, steps=steps)
+        reductions.append(result.reduction_ratio)
+        print(f"{name:<24} {result.tokens_before:>7} {result.tokens_after:>7} {result.reduction_ratio:>6.0%}")
+    print(f"평균 토큰 감소율: {statistics.mean(reductions):.1%}")
+
+    if not args.llm:
+        return
+
+    from app.services.llm_service import analyze_with_llm
+
+    print()
+    print(f"{'transcript':<24} {'raw_s':>6} {'pre_s':>6} {'dx':>3} {'sev':>4} {'obs':>5} {'med':>5}")
+    for name, text in transcripts.items():
+        started = time.perf_counter()
+        raw = analyze_with_llm(text, preprocess=False)
+        raw_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        compressed = analyze_with_llm(preprocess_transcript(text, steps=steps).text, preprocess=False)
+        compressed_seconds = time.perf_counter() - started
+
+        diff = compare_results(raw, compressed)
+        print(
+            f"{name:<24} {raw_seconds:>6.2f} {compressed_seconds:>6.2f} "
+            f"{'O' if diff['diagnosis_match'] else 'X':>3} {'O' if diff['severity_match'] else 'X':>4} "
+            f"{diff['observation_jaccard']:>5.2f} {diff['medication_jaccard']:>5.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
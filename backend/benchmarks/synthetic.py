@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+결정적 합성 데이터 생성기
+
+같은 seed에서는 항상 같은 데이터를 만듭니다.
+- 정신건강의학과 외래 진료 대화 (타임스탬프, 화자 표기, 간투사/맞장구 포함)
+- 대화에 대응하는 LLM 분석 결과 (full 형식)와 LLM 원문 응답 (코드 블록, 후행 쉼표 등 clean_json_string 대상 포함)
+- 전체 EMR DB (환자, 진료, 대화, 진단, 관찰, 약물, 통계 집계) - 1k/100k/1m 규모, 배치 bulk insert
+
+벤치마크(bench_suite.py, bench_patient_search.py)에서 import하여 사용하며, 단독으로 실행하면 파일로 저장합니다.
+
+사용법:
+    python benchmarks/synthetic.py db --scale 100k --out /tmp/emr_100k.db
+    python benchmarks/synthetic.py transcripts --count 100 --out /tmp/transcripts.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+# 상위 디렉토리를 Python 경로에 추가하여 app 모듈을 import할 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 규모별 진료 수
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# 환자당 평균 진료 수 (환자 수 = 진료 수 / ENCOUNTERS_PER_PATIENT)
+ENCOUNTERS_PER_PATIENT = 5
+
+# 생성 데이터의 기준 시각 (실행 시각과 무관하게 같은 데이터를 만들기 위해 고정)
+BASE_TIME = datetime(2024, 1, 1, 9, 0, 0)
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예경봉사부가복태목형피두감음빈동온호범좌팽승간상시갈단견당화창"
+GIVEN = "민서지현수준우영진호은연하윤성재동훈아예주원도희정소다혜승유채태경규석빈찬"
+
+# (진단명, 증상, 처방 약물)
+SCENARIOS = [
+    ("주요우울장애", ["우울감", "불면", "식욕 저하", "무쾌감증", "피로감", "자살 사고"], ["프로작 20mg", "렉사프로 10mg", "졸로푸트 50mg", "웰부트린 150mg"]),
+    ("범불안장애", ["불안", "근육 긴장", "집중력 저하", "두근거림", "불면"], ["렉사프로 10mg", "부스파 5mg", "자낙스 0.25mg"]),
+    ("공황장애", ["공황 발작", "호흡곤란", "두근거림", "예기 불안", "회피 행동"], ["팍실 20mg", "리보트릴 0.5mg"]),
+    ("양극성 장애", ["기분 고양", "수면 욕구 감소", "과소비", "우울감", "사고 비약"], ["리튬 300mg", "데파코트 500mg", "쎄로켈 100mg"]),
+    ("외상 후 스트레스 장애", ["악몽", "회피 행동", "과각성", "플래시백", "불면"], ["졸로푸트 50mg", "프라조신 1mg"]),
+    ("불면장애", ["입면 곤란", "수면 유지 곤란", "주간 졸림", "피로감"], ["스틸녹스 10mg", "트라조돈 50mg"]),
+    ("강박장애", ["강박 사고", "확인 행동", "반복적인 손 씻기", "불안"], ["루복스 50mg", "프로작 20mg"]),
+    ("성인 ADHD", ["집중력 저하", "충동성", "업무 지연", "건망증"], ["콘서타 18mg", "스트라테라 40mg"]),
+    ("적응장애", ["우울감", "불안", "업무 스트레스", "불면"], ["렉사프로 10mg", "트라조돈 50mg"]),
+    ("알코올 사용장애", ["음주 조절 실패", "금단 증상", "불면", "가족 갈등"], ["날트렉손 50mg", "캄프랄 333mg"]),
+]
+
+SEVERITIES = ("mild", "moderate", "severe")
+DURATIONS = ("일주일 전부터", "2주 전부터", "한 달 전부터", "두 달 전부터", "석 달 전부터", "반년 전부터", "작년부터")
+DOSAGES = ("아침 1정", "저녁 1정", "자기 전 1정", "1일 2회 1정", "1일 3회 식후 1정", "필요 시 1정")
+SYMPTOM_DETAILS = (
+    "거의 매일 있다고 함", "일주일에 2~3번 정도", "오후가 되면 심해진다고 함", "아침에 특히 심함",
+    "회사에서 더 심해진다고 함", "주말에는 조금 나음", "지난 진료 이후 약간 호전", "점점 심해지는 양상",
+)
+FILLERS = ("음", "어", "그러니까", "뭐랄까", "있잖아요")
+BACKCHANNELS = ("네", "네네", "아 네", "그렇군요", "음")
+SMALL_TALK = (
+    ("오늘 오시는 데 불편한 건 없으셨어요?", "네 괜찮았어요. 차가 좀 막히긴 했는데"),
+    ("요즘 날씨가 많이 춥죠?", "네 그래서 밖에 잘 안 나가게 되더라고요"),
+    ("가족분들은 요즘 어떻게 지내세요?", "다들 바빠서 얼굴 보기가 힘들어요"),
+    ("회사 일은 요즘 어떠세요?", "프로젝트 마감이 있어서 야근이 많아요"),
+    ("운동은 좀 하고 계세요?", "산책을 해보려고 하는데 잘 안 돼요"),
+)
+
+
+def _josa(word: str, with_batchim: str, without_batchim: str) -> str:
+    """받침 유무에 맞는 조사를 붙입니다 (한글이 아닌 끝 글자는 받침이 있는 것으로 처리, 예: 20mg을)."""
+    last = word[-1]
+    if "가" <= last <= "힣" and (ord(last) - 0xAC00) % 28 == 0:
+        return word + without_batchim
+    return word + with_batchim
+
+
+def make_name(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN)
+
+
+def make_patient(rng: random.Random, patient_no: int) -> Dict[str, Any]:
+    """환자 한 명의 기본 정보 (차트번호는 P0000001 형식)."""
+    return {
+        "identifier": f"P{patient_no:07d}",
+        "name": {"text": make_name(rng)},
+        "gender": rng.choice(("male", "female")),
+        "birth_date": date(1940, 1, 1) + timedelta(days=rng.randrange(365 * 65)),
+    }
+
+
+def make_llm_result(rng: random.Random, now: datetime, patient: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """진료 하나의 LLM 분석 결과 (full 형식)를 만듭니다."""
+    diagnosis, symptoms, medications = rng.choice(SCENARIOS)
+    chosen = rng.sample(symptoms, rng.randint(2, min(4, len(symptoms))))
+    now_str = now.isoformat(timespec="seconds")
+    onset = now - timedelta(days=rng.randint(7, 365))
+    patient = patient or make_patient(rng, rng.randint(1, 9_999_999))
+    return {
+        "Patient": {
+            "name": patient["name"],
+            "birth_date": patient["birth_date"].isoformat(),
+            "gender": patient["gender"],
+        },
+        "Encounter": {
+            "status": "finished",
+            "class": "AMB",
+            "type": "진료",
+            "period": {"start": now_str},
+            "reason_text": f"{rng.choice(DURATIONS)} 지속된 {_josa(chosen[0], '과', '와')} {chosen[1]}",
+        },
+        "Condition": {
+            "clinical_status": "active",
+            "verification_status": rng.choice(("provisional", "confirmed")),
+            "code": {"text": diagnosis},
+            "onset_datetime": onset.isoformat(timespec="seconds"),
+            "severity": rng.choice(SEVERITIES),
+        },
+        "Observation": [
+            {"status": "final", "code": {"text": symptom}, "value_string": rng.choice(SYMPTOM_DETAILS), "effective_datetime": now_str}
+            for symptom in chosen
+        ],
+        "MedicationStatement": [
+            {
+                "status": rng.choice(("active", "active", "active", "stopped")),
+                "medication": {"text": medication},
+                "dosage": {"text": rng.choice(DOSAGES)},
+                "effective_period": {"start": (now - timedelta(days=rng.randint(0, 180))).date().isoformat()},
+            }
+            for medication in rng.sample(medications, rng.randint(1, min(2, len(medications))))
+        ],
+    }
+
+
+def make_transcript(rng: random.Random, result: Dict[str, Any], small_talk: int = 2) -> str:
+    """분석 결과에 맞는 진료 대화를 만듭니다 (small_talk: 진료와 무관한 대화 수, 대화 길이 조절용)."""
+    lines: List[tuple[str, str]] = [("의사", "안녕하세요. 오늘은 어떻게 오셨어요?")]
+    lines.append(("환자", f"{rng.choice(FILLERS)} {result['Encounter']['reason_text']} 때문에 너무 힘들어서요."))
+    for question, answer in rng.sample(SMALL_TALK, min(small_talk, len(SMALL_TALK))):
+        lines += [("의사", question), ("환자", answer)]
+    for obs in result["Observation"]:
+        symptom = obs["code"]["text"]
+        lines.append(("의사", f"{_josa(symptom, '은', '는')} 어느 정도세요?"))
+        lines.append(("환자", f"{rng.choice(FILLERS)} {obs['value_string']}... {rng.choice(FILLERS)} 그 정도예요."))
+        if rng.random() < 0.5:
+            lines.append(("의사", rng.choice(BACKCHANNELS)))
+    for medication in result["MedicationStatement"]:
+        name = medication["medication"]["text"]
+        if medication["status"] == "stopped":
+            lines += [("의사", f"{_josa(name, '은', '는')} 계속 드시고 계세요?"), ("환자", "아니요 속이 울렁거려서 끊었어요.")]
+        else:
+            lines += [("의사", f"{_josa(name, '을', '를')} {medication['dosage']['text']} 드시면 됩니다."), ("환자", rng.choice(BACKCHANNELS))]
+    lines.append(("의사", f"지금 말씀하신 걸 보면 {result['Condition']['code']['text']} 가능성이 있어 보여요. 다음 주에 다시 뵐게요."))
+    lines.append(("환자", "네 감사합니다."))
+
+    seconds = 0
+    rendered = []
+    for speaker, text in lines:
+        seconds += rng.randint(3, 40)
+        rendered.append(f"[{seconds // 60:02d}:{seconds % 60:02d}] {speaker}: {text}")
+    return "\n".join(rendered)
+
+
+def make_llm_output(rng: random.Random, result: Dict[str, Any], messy: float = 0.5) -> str:
+    """LLM 원문 응답을 만듭니다. messy 확률로 코드 블록 마커와 후행 쉼표가 포함됩니다."""
+    raw = json.dumps(result, ensure_ascii=False, indent=rng.choice((None, 2)))
+    if rng.random() < messy:
+        raw = raw.replace("]", ",]", 1)
+        raw = raw.replace("}}", "},}", 1)
+        raw = f"분석 결과입니다.\n```json\n{raw}\n```"
+    return raw
+
+
+def make_sample(rng: random.Random, now: datetime, small_talk: int = 2) -> Dict[str, Any]:
+    """대화, LLM 원문 응답, 분석 결과 한 세트."""
+    result = make_llm_result(rng, now)
+    return {
+        "transcript": make_transcript(rng, result, small_talk),
+        "llm_output": make_llm_output(rng, result),
+        "result": result,
+    }
+
+
+def populate_db(engine, encounters: int, seed: int = 42, small_talk: int = 1, batch_size: int = 5000, progress: bool = False) -> Dict[str, int]:
+    """
+    빈 DB에 합성 EMR 데이터를 bulk insert합니다 (ORM 객체를 만들지 않고 배치 단위 INSERT).
+
+    환자는 진료 ENCOUNTERS_PER_PATIENT건당 한 명이며 모든 환자는 진료가 한 건 이상 있습니다.
+    진료 시각은 BASE_TIME부터 1년에 걸쳐 id 순서대로 분포합니다. 마지막에 통계 집계를 다시 계산합니다.
+    """
+    from sqlalchemy import insert
+    from sqlalchemy.orm import Session
+
+    from app.db.base import Base, Condition, Encounter, MedicationStatement, Observation, Patient
+    from app.models.emr import Conversation
+    from app.services.rollups import rebuild_rollups
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed)
+    num_patients = max(1, encounters // ENCOUNTERS_PER_PATIENT)
+    counts = {"patients": num_patients, "encounters": encounters, "conditions": 0, "observations": 0, "medication_statements": 0}
+    started = time.perf_counter()
+
+    patients = []
+    for start in range(0, num_patients, batch_size):
+        rows = []
+        for patient_no in range(start + 1, min(start + batch_size, num_patients) + 1):
+            patient = make_patient(rng, patient_no)
+            patients.append(patient)
+            rows.append({"id": patient_no, **patient, "created_at": BASE_TIME, "updated_at": BASE_TIME})
+        with engine.begin() as conn:
+            conn.execute(insert(Patient), rows)
+
+    span_seconds = 365 * 24 * 3600
+    obs_id = med_id = 0
+    for start in range(0, encounters, batch_size):
+        encounter_rows, conversation_rows, condition_rows, observation_rows, medication_rows = [], [], [], [], []
+        for encounter_id in range(start + 1, min(start + batch_size, encounters) + 1):
+            # 처음 num_patients건은 환자마다 한 건씩, 이후는 무작위 환자
+            patient_id = encounter_id if encounter_id <= num_patients else rng.randint(1, num_patients)
+            created_at = BASE_TIME + timedelta(seconds=(encounter_id - 1) * span_seconds // encounters)
+            result = make_llm_result(rng, created_at, patients[patient_id - 1])
+            encounter = result["Encounter"]
+            encounter_rows.append({
+                "id": encounter_id, "patient_id": patient_id, "status": encounter["status"], "class_": encounter["class"],
+                "type": encounter["type"], "period": encounter["period"], "reason_text": encounter["reason_text"],
+                "created_at": created_at, "updated_at": created_at,
+            })
+            conversation_rows.append({
+                "id": encounter_id, "encounter_id": encounter_id, "raw_text": make_transcript(rng, result, small_talk),
+                "participants": {"patient": patients[patient_id - 1]["name"]["text"]},
+                "created_at": created_at, "updated_at": created_at,
+            })
+            condition = result["Condition"]
+            condition_rows.append({
+                "id": encounter_id, "encounter_id": encounter_id, "clinical_status": condition["clinical_status"],
+                "verification_status": condition["verification_status"], "code": condition["code"],
+                "onset_datetime": datetime.fromisoformat(condition["onset_datetime"]), "severity": condition["severity"],
+                "recorded_date": created_at, "created_at": created_at, "updated_at": created_at,
+            })
+            for obs in result["Observation"]:
+                obs_id += 1
+                observation_rows.append({
+                    "id": obs_id, "encounter_id": encounter_id, "status": obs["status"], "code": obs["code"],
+                    "value_string": obs["value_string"], "effective_datetime": created_at,
+                    "created_at": created_at, "updated_at": created_at,
+                })
+            for med in result["MedicationStatement"]:
+                med_id += 1
+                medication_rows.append({
+                    "id": med_id, "encounter_id": encounter_id, "status": med["status"], "medication": med["medication"],
+                    "dosage": med["dosage"], "effective_period": med["effective_period"], "date_asserted": created_at,
+                    "created_at": created_at, "updated_at": created_at,
+                })
+        with engine.begin() as conn:
+            conn.execute(insert(Encounter), encounter_rows)
+            conn.execute(insert(Conversation), conversation_rows)
+            conn.execute(insert(Condition), condition_rows)
+            conn.execute(insert(Observation), observation_rows)
+            conn.execute(insert(MedicationStatement), medication_rows)
+        counts["conditions"] += len(condition_rows)
+        counts["observations"] += len(observation_rows)
+        counts["medication_statements"] += len(medication_rows)
+        if progress:
+            done = start + len(encounter_rows)
+            print(f"  진료 {done}/{encounters} ({time.perf_counter() - started:.0f}s)", file=sys.stderr)
+
+    with Session(engine) as db:
+        rebuild_rollups(db)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="결정적 합성 대화/LLM 결과/EMR DB 생성")
+    parser.add_argument("--seed", type=int, default=42)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    db_parser = subparsers.add_parser("db", help="합성 EMR SQLite DB 생성")
+    db_parser.add_argument("--scale", choices=SCALES, default="1k", help="진료 수 (1k, 100k, 1m)")
+    db_parser.add_argument("--encounters", type=int, help="진료 수 직접 지정 (--scale보다 우선)")
+    db_parser.add_argument("--small-talk", type=int, default=1, help="대화당 진료와 무관한 대화 수 (DB 크기 조절)")
+    db_parser.add_argument("--out", required=True, help="생성할 SQLite 파일 경로 (이미 있으면 중단)")
+
+    transcripts_parser = subparsers.add_parser("transcripts", help="대화/LLM 원문 응답/분석 결과를 JSONL로 저장")
+    transcripts_parser.add_argument("--count", type=int, default=100)
+    transcripts_parser.add_argument("--small-talk", type=int, default=2)
+    transcripts_parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.command == "transcripts":
+        with open(args.out, "w", encoding="utf-8") as f:
+            for i in range(args.count):
+                sample = make_sample(rng, BASE_TIME + timedelta(hours=i), args.small_talk)
+                f.write(json.dumps(sample, ensure_ascii=False) + "\n")
+        print(f"{args.count}건을 {args.out}에 저장했습니다.")
+        return
+
+    if os.path.exists(args.out):
+        parser.error(f"{args.out} 파일이 이미 있습니다.")
+    from app.db.session import create_write_engine
+
+    encounters = args.encounters or SCALES[args.scale]
+    engine = create_write_engine(f"sqlite:///{os.path.abspath(args.out)}", pool_size=1, max_overflow=0)
+    started = time.perf_counter()
+    counts = populate_db(engine, encounters, seed=args.seed, small_talk=args.small_talk, progress=True)
+    engine.dispose()
+    print(
+        f"{args.out}: " + ", ".join(f"{name} {count}" for name, count in counts.items())
+        + f" ({time.perf_counter() - started:.1f}s, {os.path.getsize(args.out) / 1e6:.0f}MB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+서버 시작(import) 시간 예산 검사
+
+`python -X importtime -c "import app.main"`을 새 프로세스에서 여러 번 실행하여 가장 빠른 값을 예산과 비교하고,
+처음 사용할 때 불러오도록 미룬 무거운 모듈(openai 등)과 설정(.env)이 import 시점에 로드되지 않는지 확인합니다.
+Azure OpenAI 설정 없이, backend 디렉토리의 .env를 읽지 않도록 임시 디렉토리에서 실행하므로
+EMR API만으로 서버가 시작되는지도 함께 검사합니다.
+예산을 넘거나 지연 로드 대상 모듈 또는 설정이 로드되면 종료 코드 1을 반환합니다 (CI에서 사용).
+
+사용법:
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget-ms 800 --runs 5 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import app.main 시점에 로드되면 안 되는 모듈 (처음 사용할 때 import)
+LAZY_MODULES = ("openai",)
+
+_PROBE = (
+    "import sys, app.main; "
+    "from app.config import get_settings; "
+    "print(','.join(m for m in {modules!r} if m in sys.modules)); "
+    "print(get_settings.cache_info().currsize)"
+)
+
+
+def measure() -> tuple[int, dict[str, int], list[str], bool]:
+    """
+    새 프로세스에서 app.main을 import하고
+    (전체 μs, app.main이 직접 import한 모듈별 누적 μs, 로드된 지연 모듈, 설정 로드 여부)를 반환합니다.
+    """
+    env = {k: v for k, v in os.environ.items() if not k.startswith("AZURE_")}
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, (BACKEND_DIR, env.get("PYTHONPATH"))))
+    with tempfile.TemporaryDirectory() as cwd:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PROBE.format(modules=LAZY_MODULES)],
+            cwd=cwd,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"app.main import 실패 (종료 코드 {proc.returncode})")
+
+    # 형식: "import time: self [us] | cumulative | imported package" (들여쓰기 = 중첩 깊이)
+    # 하위 모듈이 상위 모듈보다 먼저 출력되므로, 최상위 모듈이 나올 때까지 깊이 1 항목을 모아 둠
+    total = 0
+    children: dict[str, int] = {}
+    pending: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 1:
+            pending[name.strip()] = int(cumulative)
+        elif depth == 0:
+            if name.strip() == "app.main":
+                total, children = int(cumulative), pending
+            pending = {}
+    modules_line, settings_line = proc.stdout.splitlines()[-2:]
+    loaded = [m for m in modules_line.split(",") if m]
+    return total, children, loaded, settings_line != "0"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="app.main import 시간 예산 검사")
+    parser.add_argument("--budget-ms", type=float, default=1200.0, help="import 시간 예산 (ms)")
+    parser.add_argument("--runs", type=int, default=3, help="측정 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--top", type=int, default=10, help="출력할 느린 모듈 수")
+    args = parser.parse_args()
+
+    best_total, best_modules, loaded, settings_loaded = min((measure() for _ in range(args.runs)), key=lambda r: r[0])
+    total_ms = best_total / 1000
+
+    print(f"{'module':<40} {'cumulative_ms':>13}")
+    for name, micros in sorted(best_modules.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<40} {micros / 1000:>13.1f}")
+    print(f"전체 import 시간: {total_ms:.1f}ms (예산 {args.budget_ms:.0f}ms, {args.runs}회 중 최솟값)")
+
+    failed = False
+    if loaded:
+        print(f"❌ 지연 로드 대상 모듈이 import 시점에 로드되었습니다: {', '.join(loaded)}")
+        failed = True
+    if settings_loaded:
+        print("❌ 설정(.env)이 import 시점에 로드되었습니다 (settings 속성은 함수 안에서 읽어야 합니다).")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"❌ import 시간이 예산을 {total_ms - args.budget_ms:.1f}ms 초과했습니다.")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ import 시간 예산 이내입니다.")
+
+
+if __name__ == "__main__":
+    main()
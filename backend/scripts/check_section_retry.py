@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+잘린 LLM 응답의 섹션 재요청 검사
+
+가짜 LLM 클라이언트로 Observation 뒤에서 잘린 full 형식 응답을 돌려준 뒤,
+응답에 없어도 되는 MedicationStatement도 누락으로 보고 재요청하는지, 재요청 결과가 분석 결과에 반영되는지 확인합니다.
+Azure OpenAI 설정이나 네트워크 없이 실행되며, 검사에 실패하면 종료 코드 1을 반환합니다 (CI에서 사용).
+
+사용법:
+    python scripts/check_section_retry.py
+"""
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# 상위 디렉토리를 Python 경로에 추가하여 app 모듈을 import할 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.services import llm_service
+
+MEDICATIONS = [{
+    "status": "active",
+    "medication": {"text": "에스시탈로프람 10mg"},
+    "dosage": {"text": "1일 1회"},
+    "effective_period": {"start": "2024-01-01"},
+}]
+
+
+class FakeCompletions:
+    """첫 호출에는 잘린 응답을, 재요청에는 요청된 섹션만 돌려주고 받은 시스템 프롬프트를 기록합니다."""
+
+    def __init__(self, first_response: str):
+        self.first_response = first_response
+        self.system_prompts: list[str] = []
+
+    def create(self, messages, **kwargs):
+        self.system_prompts.append(messages[0]["content"])
+        if len(self.system_prompts) == 1:
+            content = self.first_response
+        else:
+            content = json.dumps({"MedicationStatement": MEDICATIONS}, ensure_ascii=False)
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def truncated_response() -> str:
+    """Observation까지만 온전하고 MedicationStatement 중간에서 잘린 full 형식 응답입니다."""
+    full = llm_service._full_placeholders("2024-01-01T09:00:00")
+    full["MedicationStatement"] = MEDICATIONS
+    raw = json.dumps(full, ensure_ascii=False)
+    return raw[:raw.index('"MedicationStatement"') + len('"MedicationStatement": [{"sta')]
+
+
+def main() -> None:
+    settings.LLM_OUTPUT_FORMAT = "full"
+    settings.LLM_SECTION_RETRY = True
+    completions = FakeCompletions(truncated_response())
+    llm_service.get_client = lambda: SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    result = llm_service.analyze_with_llm("의사: 요즘 어떠세요?\n환자: 잠을 잘 못 자요.", preprocess=False)
+
+    failures = []
+    if len(completions.system_prompts) != 2:
+        failures.append(f"LLM 호출 수가 2회가 아닙니다 ({len(completions.system_prompts)}회)")
+    elif "다음 리소스만 출력하세요: MedicationStatement" not in completions.system_prompts[1]:
+        failures.append("잘린 MedicationStatement를 재요청하지 않았습니다")
+    if result.get("MedicationStatement") != MEDICATIONS:
+        failures.append(f"재요청한 MedicationStatement가 결과에 없습니다: {result.get('MedicationStatement')!r}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ 잘린 응답의 누락 섹션을 재요청했습니다.")
+
+
+if __name__ == "__main__":
+    main()
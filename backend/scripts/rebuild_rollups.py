@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+import sys
+import os
+
+# 상위 디렉토리를 Python 경로에 추가하여 app 모듈을 import할 수 있게 함
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.services.rollups import rebuild_rollups
+
+def main() -> None:
+    print("통계 집계 테이블을 다시 계산합니다...")
+    init_db()
+    with SessionLocal() as db:
+        daily_encounters, daily_codes, code_totals = rebuild_rollups(db)
+    print(f"일별 진료 {daily_encounters}행, 일별 항목 {daily_codes}행, 전체 항목 {code_totals}행")
+    print("완료되었습니다!")
+
+if __name__ == "__main__":
+    main()